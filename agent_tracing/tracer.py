@@ -0,0 +1,378 @@
+# Lightweight Tracing (spans + optional sampling profiler)
+"""
+Nested timing spans for agent runs, LLM calls, tool calls, graph nodes,
+HTTP fetches and DB writes, written to a local file you can open as a
+flame graph with no outside service.
+
+Enable it with environment variables, no code changes needed:
+
+    AGENT_TRACE=trace.json python main.py            # Chrome trace format
+    AGENT_TRACE=trace.otlp.json python main.py       # OTLP-JSON
+    AGENT_TRACE_PROFILE=5 AGENT_TRACE=trace.json ... # + stack sample every 5 ms
+
+Chrome traces open in https://ui.perfetto.dev or chrome://tracing (both run
+locally in the browser). The profiler writes ``<trace>.folded`` stacks for
+speedscope or flamegraph.pl. With tracing off, spans cost one global check.
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Span categories used across the examples
+AGENT = "agent"
+LLM = "llm"
+TOOL = "tool"
+GRAPH_NODE = "graph_node"
+HTTP = "http"
+DB = "db"
+
+# Checked from the code flags so importing this module doesn't pull in asyncio
+_CO_COROUTINE = 0x80
+
+_current_span = contextvars.ContextVar("agent_tracing_span", default=None)
+_tracer = None
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "category",
+        "attrs",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "lane",
+        "error",
+    )
+
+    def __init__(self, name, category, attrs, parent, lane):
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+        self.lane = lane
+        self.error = None
+
+    def set(self, **attrs):
+        """Attach attributes discovered while the span is running."""
+        self.attrs.update(attrs)
+
+
+def _lane():
+    """Where a span is drawn: its asyncio task if any, else its thread.
+
+    Concurrent tasks on one thread get separate lanes so their spans nest
+    correctly instead of overlapping.
+    """
+    task = None
+    asyncio = sys.modules.get("asyncio")  # No event loop if it was never imported
+    if asyncio is not None:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            pass
+    if task is not None:
+        return id(task) & 0x7FFFFFFF, task.get_name()
+    thread = threading.current_thread()
+    return thread.ident & 0x7FFFFFFF, thread.name
+
+
+class Tracer:
+    def __init__(self, path, service_name=None, profile_interval_ms=None):
+        self.path = path
+        self.service_name = service_name or os.path.basename(sys.argv[0]) or "python"
+        self.spans = []
+        self.lanes = {}
+        # Map perf_counter (precise) onto wall-clock time for OTLP timestamps
+        self.epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+        self.origin_ns = time.perf_counter_ns()
+        self.profiler = (
+            SamplingProfiler(profile_interval_ms / 1000)
+            if profile_interval_ms
+            else None
+        )
+        if self.profiler:
+            self.profiler.start()
+
+    def record(self, finished):
+        self.spans.append(finished)  # list.append is atomic under the GIL
+
+    def write(self):
+        if self.profiler:
+            self.profiler.stop()
+            self.profiler.write(f"{self.path}.folded")
+        if self.path.endswith(".otlp.json"):
+            payload = self._otlp()
+        else:
+            payload = self._chrome()
+        with open(self.path, "w") as f:
+            json.dump(payload, f)
+        print(f"📊 Trace with {len(self.spans)} spans saved to {self.path}")
+
+    def _chrome(self):
+        pid = os.getpid()
+        events = [
+            {
+                "ph": "M",
+                "name": "process_name",
+                "pid": pid,
+                "args": {"name": self.service_name},
+            }
+        ]
+        for lane, lane_name in self.lanes.items():
+            events.append(
+                {
+                    "ph": "M",
+                    "name": "thread_name",
+                    "pid": pid,
+                    "tid": lane,
+                    "args": {"name": lane_name},
+                }
+            )
+        for s in self.spans:
+            args = dict(s.attrs)
+            if s.error:
+                args["error"] = s.error
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": s.category,
+                    "ph": "X",
+                    "ts": (s.start_ns - self.origin_ns) / 1000,
+                    "dur": (s.end_ns - s.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": s.lane,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def _otlp(self):
+        spans = []
+        for s in self.spans:
+            attrs = {"category": s.category, **s.attrs}
+            span = {
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(s.start_ns + self.epoch_offset_ns),
+                "endTimeUnixNano": str(s.end_ns + self.epoch_offset_ns),
+                "attributes": [_otlp_attribute(k, v) for k, v in attrs.items()],
+                "status": {"code": 2, "message": s.error} if s.error else {},
+            }
+            if s.parent_id:
+                span["parentSpanId"] = s.parent_id
+            spans.append(span)
+        resource = {"attributes": [_otlp_attribute("service.name", self.service_name)]}
+        return {
+            "resourceSpans": [
+                {
+                    "resource": resource,
+                    "scopeSpans": [
+                        {"scope": {"name": "agent_tracing"}, "spans": spans}
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class SamplingProfiler:
+    """Samples every thread's Python stack on a fixed interval.
+
+    Stacks are aggregated in "folded" format (``a;b;c count``), which
+    speedscope and flamegraph.pl render as a flame graph.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="agent-tracing-profiler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    stack.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        print(f"🔥 {sum(self.samples.values())} profiler samples saved to {path}")
+
+
+@contextmanager
+def span(name, category="function", **attrs):
+    """Time a block as a span nested under the currently open span."""
+    tracer = _tracer
+    if tracer is None:
+        yield None
+        return
+    lane, lane_name = _lane()
+    tracer.lanes.setdefault(lane, lane_name)
+    current = Span(name, category, attrs, _current_span.get(), lane)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.perf_counter_ns()
+        _current_span.reset(token)
+        tracer.record(current)
+
+
+def traced(category="function", name=None):
+    """Decorator form of ``span`` for sync and async functions."""
+
+    def decorator(func):
+        label = name or func.__qualname__
+        if func.__code__.co_flags & _CO_COROUTINE:
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(label, category):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with span(label, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_openai():
+    """Wrap the OpenAI SDK's model calls in ``llm`` spans.
+
+    Every framework here that talks to OpenAI-compatible APIs (PydanticAI,
+    Agno, AutoGen, SmolAgents, instructor, CrewAI via LiteLLM) goes through
+    ``chat.completions.create`` or ``responses.create``. For streamed calls
+    the span ends when the stream is opened.
+    """
+    try:
+        from openai.resources.chat.completions import AsyncCompletions, Completions
+        from openai.resources.responses import AsyncResponses, Responses
+    except ImportError:
+        return
+    _wrap_create(Completions, AsyncCompletions, "chat.completions")
+    _wrap_create(Responses, AsyncResponses, "responses")
+
+
+def _wrap_create(sync_cls, async_cls, span_name):
+    if getattr(sync_cls.create, "_agent_traced", False):
+        return
+    sync_create = sync_cls.create
+    async_create = async_cls.create
+
+    @functools.wraps(sync_create)
+    def create(self, *args, **kwargs):
+        with span(span_name, LLM, model=str(kwargs.get("model"))) as s:
+            response = sync_create(self, *args, **kwargs)
+            _record_usage(s, response)
+            return response
+
+    @functools.wraps(async_create)
+    async def acreate(self, *args, **kwargs):
+        with span(span_name, LLM, model=str(kwargs.get("model"))) as s:
+            response = await async_create(self, *args, **kwargs)
+            _record_usage(s, response)
+            return response
+
+    create._agent_traced = acreate._agent_traced = True
+    sync_cls.create = create
+    async_cls.create = acreate
+
+
+def _record_usage(s, response):
+    usage = getattr(response, "usage", None)
+    if s is None or usage is None:
+        return
+    # Chat completions and the Responses API name their token counts differently
+    for attr in ("prompt_tokens", "completion_tokens", "input_tokens", "output_tokens"):
+        value = getattr(usage, attr, None)
+        if isinstance(value, int):
+            s.set(**{attr: value})
+
+
+def start_tracing(path="trace.json", profile_interval_ms=None):
+    """Start collecting spans; the file is written by ``stop_tracing`` or at exit."""
+    global _tracer
+    if _tracer is not None:
+        return _tracer
+    _tracer = Tracer(path, profile_interval_ms=profile_interval_ms)
+    instrument_openai()
+    atexit.register(stop_tracing)
+    return _tracer
+
+
+def stop_tracing():
+    """Stop tracing and write the trace file."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.write()
+
+
+if os.environ.get("AGENT_TRACE"):
+    _interval = os.environ.get("AGENT_TRACE_PROFILE")
+    start_tracing(
+        os.environ["AGENT_TRACE"],
+        profile_interval_ms=float(_interval) if _interval else None,
+    )
@@ -0,0 +1,171 @@
+# python3.10 backtest.py --download          (fetch 10y of history once)
+# python3.10 backtest.py                     (sweep thresholds over local files)
+# python3.10 backtest.py --synthetic 500     (timing run: 500 symbols x 10 years)
+"""
+Backtest the price-change alert rule against historical closes.
+
+History is loaded from local CSV files (one per symbol, as written by
+yfinance's ``history().to_csv()``) into a single date x symbol matrix.
+Every threshold in the sweep is evaluated over the whole matrix at once with
+the same ``calculate_percent_change`` / ``is_significant_change`` rule used by
+the live system.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from config import PRICE_CHANGE_THRESHOLD, STOCK_SYMBOLS
+from stock_tools import calculate_percent_change, is_significant_change
+
+DEFAULT_DATA_DIR = Path(__file__).parent / "history"
+DEFAULT_THRESHOLDS = [1.0, 2.0, 3.0, 4.0, 5.0, 7.5, 10.0, 15.0]
+DEFAULT_HORIZONS = [1, 5, 20]  # trading days
+
+
+def download_history(symbols, data_dir, period="10y"):
+    """Fetch daily closes with yfinance and store one CSV per symbol."""
+    import yfinance as yf
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for symbol in symbols:
+        hist = yf.Ticker(symbol).history(period=period)
+        if hist.empty:
+            print(f"⚠️  No history returned for {symbol}")
+            continue
+        hist[["Close"]].to_csv(data_dir / f"{symbol}.csv")
+        print(f"💾 Saved {len(hist)} rows for {symbol}")
+
+
+def load_history(symbols, data_dir):
+    """Load local CSVs into a date x symbol matrix of closing prices."""
+    closes = {}
+    for symbol in symbols:
+        path = data_dir / f"{symbol}.csv"
+        if not path.exists():
+            print(f"⚠️  Missing history for {symbol} ({path})")
+            continue
+        frame = pd.read_csv(path, usecols=["Date", "Close"])
+        # yfinance writes tz-aware timestamps; only the trading day matters here
+        dates = pd.to_datetime(frame["Date"], utc=True).dt.tz_localize(None)
+        closes[symbol] = pd.Series(
+            frame["Close"].to_numpy(), index=dates.dt.normalize()
+        )
+    if not closes:
+        raise FileNotFoundError(f"No history files found in {data_dir}")
+    return pd.DataFrame(closes).sort_index()
+
+
+def synthetic_history(n_symbols, n_years, seed=0):
+    """Random-walk closes, used to time the sweep at realistic universe sizes."""
+    rng = np.random.default_rng(seed)
+    n_days = 252 * n_years
+    returns = rng.standard_t(df=3, size=(n_days, n_symbols)) * 0.012
+    prices = 100 * np.exp(np.cumsum(returns, axis=0))
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_days)
+    symbols = [f"SYM{i:04d}" for i in range(n_symbols)]
+    return pd.DataFrame(prices, index=dates, columns=symbols)
+
+
+def sweep_thresholds(closes, thresholds, horizons):
+    """Evaluate each alert threshold over the full date x symbol matrix."""
+    prices = closes.to_numpy(dtype=float)
+    n_days = prices.shape[0]
+
+    # Day-over-day change, exactly as the live alert computes it
+    prev = np.full_like(prices, np.nan)
+    prev[1:] = prices[:-1]
+    change = calculate_percent_change(prev, prices)
+
+    # Forward returns from each alert day's close, one matrix per horizon
+    forward = {}
+    for h in horizons:
+        future = np.full_like(prices, np.nan)
+        if h < n_days:
+            future[:-h] = prices[h:]
+        forward[h] = calculate_percent_change(prices, future)
+    # Signed so positive means the move continued in the alert's direction
+    direction = np.sign(change)
+    continuation = {h: forward[h] * direction for h in horizons}
+
+    years = n_days / 252
+    rows = []
+    for threshold in thresholds:
+        alerts = is_significant_change(change, threshold)
+        total = int(alerts.sum())
+
+        # Clustering: alerts that follow an alert on the previous trading day
+        # for the same symbol, and alerts that land on the same day
+        repeat = alerts[1:] & alerts[:-1]
+        per_day = alerts.sum(axis=1)
+
+        row = {
+            "threshold_%": threshold,
+            "alerts": total,
+            "alerts/yr": total / years if years else 0.0,
+            "symbols_hit": int(alerts.any(axis=0).sum()),
+            "alert_days": int((per_day > 0).sum()),
+            "max_same_day": int(per_day.max()) if n_days else 0,
+            "next_day_repeat_%": 100 * repeat.sum() / total if total else 0.0,
+        }
+        for h in horizons:
+            row[f"fwd_{h}d_%"] = np.nanmean(forward[h][alerts]) if total else np.nan
+            row[f"cont_{h}d_%"] = (
+                np.nanmean(continuation[h][alerts]) if total else np.nan
+            )
+        rows.append(row)
+
+    return pd.DataFrame(rows).set_index("threshold_%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest alert thresholds")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--symbols", nargs="+", default=STOCK_SYMBOLS)
+    parser.add_argument("--thresholds", nargs="+", type=float)
+    parser.add_argument("--horizons", nargs="+", type=int, default=DEFAULT_HORIZONS)
+    parser.add_argument(
+        "--download", action="store_true", help="Fetch history before running"
+    )
+    parser.add_argument("--period", default="10y", help="yfinance period to fetch")
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="N_SYMBOLS",
+        help="Use N random-walk symbols instead of local files",
+    )
+    parser.add_argument("--years", type=int, default=10, help="Synthetic history")
+    args = parser.parse_args()
+
+    thresholds = sorted(
+        set(args.thresholds or DEFAULT_THRESHOLDS) | {PRICE_CHANGE_THRESHOLD}
+    )
+
+    if args.synthetic:
+        closes = synthetic_history(args.synthetic, args.years)
+    else:
+        if args.download:
+            download_history(args.symbols, args.data_dir, args.period)
+        closes = load_history(args.symbols, args.data_dir)
+
+    print("📈 Backtesting stock alert thresholds...")
+    print(
+        f"   {closes.shape[1]} symbols x {closes.shape[0]} days "
+        f"({closes.index[0]:%Y-%m-%d} → {closes.index[-1]:%Y-%m-%d})"
+    )
+    print("=" * 50)
+
+    start = time.perf_counter()
+    report = sweep_thresholds(closes, thresholds, args.horizons)
+    elapsed = time.perf_counter() - start
+
+    print(report.to_string(float_format="{:.2f}".format))
+    print("=" * 50)
+    print(f"Current threshold: {PRICE_CHANGE_THRESHOLD}%")
+    print(f"⏱️  Swept {len(thresholds)} thresholds in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 # python3.10 main.py
 import smtplib
+from contextlib import nullcontext
 from email.mime.text import MIMEText
 
 from config import (EMAIL_PASSWORD, EMAIL_RECEIVER, EMAIL_SENDER,
                     PRICE_CHANGE_THRESHOLD, STOCK_SYMBOLS)
 from crewai import Agent, Crew, Task
+from stock_tools import (calculate_percent_change, get_latest_stock_price,
+                         is_significant_change)
+
+try:
+    # Optional tracing: run with PYTHONPATH=../agent_tracing to enable it
+    from tracer import AGENT, span
+except ImportError:
+    AGENT = None
+
+    def span(name, category=None, **attrs):
+        return nullcontext()
 
 
 # Tool: Email sender
@@ -19,6 +31,32 @@ def send_email_alert(subject, body):
         server.sendmail(EMAIL_SENDER, EMAIL_RECEIVER, msg.as_string())
 
 
+def fetch_price_changes(symbols):
+    # The alert decision is made here, with the same rule backtest.py replays,
+    # rather than left to the LLM
+    changes = {}
+    for symbol in symbols:
+        prev, current = get_latest_stock_price(symbol)
+        if prev is None:
+            print(f"⚠️  Not enough price history for {symbol}")
+            continue
+        percent = calculate_percent_change(prev, current)
+        significant = bool(is_significant_change(percent, PRICE_CHANGE_THRESHOLD))
+        changes[symbol] = (prev, current, percent, significant)
+    return changes
+
+
+def format_price_changes(changes):
+    lines = []
+    for symbol, (prev, current, percent, significant) in changes.items():
+        flag = "ALERT" if significant else "no alert"
+        lines.append(
+            f"- {symbol}: previous close {prev:.2f}, current {current:.2f}, "
+            f"change {percent:+.2f}% ({flag})"
+        )
+    return "\n".join(lines)
+
+
 # Create CrewAI Agents
 researcher = Agent(
     role="Stock Price Researcher",
@@ -42,12 +80,10 @@ analyst = Agent(
 
 
 # Create CrewAI Tasks
-def create_research_task():
+def create_research_task(changes):
     return Task(
-        description=f"""Fetch current and previous stock prices for the following symbols: {', '.join(STOCK_SYMBOLS)}.
-        For each symbol, retrieve:
-        1. Previous closing price
-        2. Current price
+        description=f"""Review the latest stock prices for the following symbols: {', '.join(changes)}.
+        {format_price_changes(changes)}
         
         Return the data in a structured format that can be used for analysis.""",
         agent=researcher,
@@ -58,12 +94,13 @@ def create_research_task():
 def create_analysis_task():
     return Task(
         description=f"""Analyze the stock price data and:
-        1. Calculate percentage change for each stock
-        2. Identify stocks with changes >= {PRICE_CHANGE_THRESHOLD}%
-        3. Generate insights and alerts for significant changes
-        4. If significant changes are detected, prepare email alerts
+        1. Generate insights for each stock
+        2. Generate alerts for the stocks marked ALERT (moved at least
+           {PRICE_CHANGE_THRESHOLD}% up or down)
+        3. If any stock is marked ALERT, prepare email alerts
         
-        Use the stock price data from the research task.""",
+        Use the stock price data from the research task; the percent changes
+        and ALERT flags are already computed, do not recompute them.""",
         agent=analyst,
         expected_output="Analysis report with insights, alerts, and email notifications if needed",
     )
@@ -73,8 +110,13 @@ def main():
     print("🚀 Starting Stock Alert System with CrewAI...")
     print("=" * 50)
 
+    changes = fetch_price_changes(STOCK_SYMBOLS)
+    if not changes:
+        print("❌ No stock prices available")
+        return
+
     # Create tasks
-    research_task = create_research_task()
+    research_task = create_research_task(changes)
     analysis_task = create_analysis_task()
 
     # Create and execute crew
@@ -85,7 +127,8 @@ def main():
     )
 
     # Execute the crew
-    result = crew.kickoff()
+    with span("crew.kickoff", AGENT, tasks=len(crew.tasks)):
+        result = crew.kickoff()
 
     print("\n" + "=" * 50)
     print("🏁 CrewAI Stock Alert System completed.")
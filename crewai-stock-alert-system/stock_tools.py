@@ -1,6 +1,7 @@
 import random
 import time
 
+import numpy as np
 import yfinance as yf
 
 
@@ -19,6 +20,15 @@ def get_latest_stock_price(symbol):
 
 
 def calculate_percent_change(prev, current):
-    if prev == 0:
-        return 0
-    return ((current - prev) / prev) * 100
+    # Accepts scalars or whole arrays (e.g. a date x symbol price matrix),
+    # so backtest.py evaluates exactly the same rule as the live alerts.
+    prev = np.asarray(prev, dtype=float)
+    current = np.asarray(current, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.where(prev == 0, 0.0, ((current - prev) / prev) * 100)
+    return change.item() if change.ndim == 0 else change
+
+
+def is_significant_change(percent_change, threshold):
+    # An alert fires when the stock moved up or down by at least the threshold
+    return np.abs(percent_change) >= threshold
@@ -0,0 +1,398 @@
+# python3.10 benchmark.py
+# python3.10 benchmark.py --frameworks agno pydantic_ai --latency 0.1
+"""
+Compare the overhead of each agent framework against the same local stub LLM.
+
+Every framework runs in its own fresh interpreter (so import time and peak
+memory aren't polluted by the others) against ``stub_server.py``, which
+answers every request with a fixed reply after a fixed delay. Anything above
+that delay is framework (and HTTP client) overhead.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+
+from stub_server import start_stub_server
+
+MODEL = "gpt-4o-mini"
+PROMPT = "Say 'Hello, World!'"
+API_KEY = "stub"
+
+
+class OpenAIBaseline:
+    """The bare OpenAI client: the floor every framework is compared with."""
+
+    def load(self):
+        import openai
+
+        self.openai = openai
+
+    def build(self, base_url):
+        return self.openai.OpenAI(base_url=base_url, api_key=API_KEY)
+
+    def call(self, client):
+        client.chat.completions.create(
+            model=MODEL, messages=[{"role": "user", "content": PROMPT}]
+        )
+
+
+class CrewAIAdapter:
+    def load(self):
+        import crewai
+
+        self.crewai = crewai
+
+    def build(self, base_url):
+        crewai = self.crewai
+        llm = crewai.LLM(model=f"openai/{MODEL}", base_url=base_url, api_key=API_KEY)
+        agent = crewai.Agent(
+            role="Greeter",
+            goal="Greet the user",
+            backstory="You are a cheerful assistant.",
+            llm=llm,
+            allow_delegation=False,
+        )
+        task = crewai.Task(
+            description=PROMPT, expected_output="A greeting.", agent=agent
+        )
+        return crewai.Crew(agents=[agent], tasks=[task])
+
+    def call(self, crew):
+        crew.kickoff()
+
+
+class GreetingState(TypedDict):
+    question: str
+    answer: str
+
+
+class LangGraphAdapter:
+    """LangGraph has no model client of its own; one node calls OpenAI."""
+
+    def load(self):
+        import langgraph.graph
+        import openai
+
+        self.graph, self.openai = langgraph.graph, openai
+
+    def build(self, base_url):
+        client = self.openai.OpenAI(base_url=base_url, api_key=API_KEY)
+
+        def answer_node(state: GreetingState) -> dict:
+            response = client.chat.completions.create(
+                model=MODEL, messages=[{"role": "user", "content": state["question"]}]
+            )
+            return {"answer": response.choices[0].message.content}
+
+        graph = self.graph.StateGraph(GreetingState)
+        graph.add_node("answer", answer_node)
+        graph.add_edge(self.graph.START, "answer")
+        graph.add_edge("answer", self.graph.END)
+        return graph.compile()
+
+    def call(self, app):
+        app.invoke({"question": PROMPT, "answer": ""})
+
+
+class AutoGenAdapter:
+    is_async = True
+
+    def load(self):
+        from autogen_agentchat.agents import AssistantAgent
+        from autogen_core import CancellationToken
+        from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+        self.AssistantAgent = AssistantAgent
+        self.CancellationToken = CancellationToken
+        self.OpenAIChatCompletionClient = OpenAIChatCompletionClient
+
+    def build(self, base_url):
+        client = self.OpenAIChatCompletionClient(
+            model=MODEL, base_url=base_url, api_key=API_KEY
+        )
+        return self.AssistantAgent("assistant", model_client=client)
+
+    async def acall(self, agent):
+        await agent.run(task=PROMPT)
+        # Drop the conversation so every call sends the same request
+        await agent.on_reset(self.CancellationToken())
+
+
+class AgnoAdapter:
+    def load(self):
+        from agno.agent import Agent
+        from agno.models.openai import OpenAIChat
+
+        self.Agent, self.OpenAIChat = Agent, OpenAIChat
+
+    def build(self, base_url):
+        model = self.OpenAIChat(id=MODEL, base_url=base_url, api_key=API_KEY)
+        return self.Agent(model=model, instructions="Provide concise answers.")
+
+    def call(self, agent):
+        agent.run(PROMPT)
+
+
+class PydanticAIAdapter:
+    is_async = True
+
+    def load(self):
+        from pydantic_ai import Agent
+        from pydantic_ai.providers.openai import OpenAIProvider
+
+        try:
+            from pydantic_ai.models.openai import OpenAIChatModel as OpenAIModel
+        except ImportError:  # Older pydantic_ai releases
+            from pydantic_ai.models.openai import OpenAIModel
+
+        self.Agent, self.OpenAIModel = Agent, OpenAIModel
+        self.OpenAIProvider = OpenAIProvider
+
+    def build(self, base_url):
+        provider = self.OpenAIProvider(base_url=base_url, api_key=API_KEY)
+        return self.Agent(
+            self.OpenAIModel(MODEL, provider=provider),
+            system_prompt="Be concise, reply with one sentence.",
+        )
+
+    async def acall(self, agent):
+        await agent.run(PROMPT)
+
+
+class SmolAgentsAdapter:
+    def load(self):
+        from smolagents import CodeAgent, OpenAIServerModel
+
+        self.CodeAgent, self.OpenAIServerModel = CodeAgent, OpenAIServerModel
+
+    def build(self, base_url):
+        model = self.OpenAIServerModel(
+            model_id=MODEL, api_base=base_url, api_key=API_KEY
+        )
+        return self.CodeAgent(tools=[], model=model, max_steps=2, verbosity_level=0)
+
+    def call(self, agent):
+        agent.run(PROMPT)
+
+
+FRAMEWORKS = {
+    "openai": OpenAIBaseline,
+    "crewai": CrewAIAdapter,
+    "langgraph": LangGraphAdapter,
+    "autogen": AutoGenAdapter,
+    "agno": AgnoAdapter,
+    "pydantic_ai": PydanticAIAdapter,
+    "smolagents": SmolAgentsAdapter,
+}
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_worker(name, base_url, calls, concurrency):
+    """Measure one framework in this (fresh) process and return the numbers."""
+    adapter = FRAMEWORKS[name]()
+    is_async = getattr(adapter, "is_async", False)
+
+    start = time.perf_counter()
+    adapter.load()
+    import_s = time.perf_counter() - start
+
+    build_times = []
+    agents = []
+    for _ in range(max(concurrency, 5)):
+        start = time.perf_counter()
+        agents.append(adapter.build(base_url))
+        build_times.append(time.perf_counter() - start)
+
+    if is_async:
+        latencies, elapsed = asyncio.run(
+            _measure_async(adapter, agents, calls, concurrency)
+        )
+    else:
+        latencies, elapsed = _measure_sync(adapter, agents, calls, concurrency)
+
+    return {
+        "framework": name,
+        "import_s": import_s,
+        "build_ms": statistics.median(build_times) * 1000,
+        "call_ms": statistics.median(latencies) * 1000,
+        "throughput": calls / elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _measure_sync(adapter, agents, calls, concurrency):
+    adapter.call(agents[0])  # Warm up connections and lazy imports
+
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        adapter.call(agents[0])
+        latencies.append(time.perf_counter() - start)
+
+    # Each worker thread drives its own agent; agents aren't all thread-safe
+    def drive(agent, n):
+        for _ in range(n):
+            adapter.call(agent)
+
+    shares = _split(calls, concurrency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(drive, agents[:concurrency], shares))
+    return latencies, time.perf_counter() - start
+
+
+async def _measure_async(adapter, agents, calls, concurrency):
+    await adapter.acall(agents[0])
+
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await adapter.acall(agents[0])
+        latencies.append(time.perf_counter() - start)
+
+    async def drive(agent, n):
+        for _ in range(n):
+            await adapter.acall(agent)
+
+    shares = _split(calls, concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(a, n) for a, n in zip(agents, shares)))
+    return latencies, time.perf_counter() - start
+
+
+def _split(total, parts):
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def worker_env(base_url):
+    """Environment for worker processes: stub credentials, no telemetry."""
+    return {
+        **os.environ,
+        "OPENAI_API_KEY": API_KEY,
+        "OPENAI_BASE_URL": base_url,
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+        "AGNO_TELEMETRY": "false",
+        "ANONYMIZED_TELEMETRY": "false",
+    }
+
+
+# (title, result key, column width, number format)
+COLUMNS = [
+    ("framework", "framework", 12, ""),
+    ("import s", "import_s", 9, ".2f"),
+    ("build ms", "build_ms", 9, ".2f"),
+    ("call ms", "call_ms", 9, ".1f"),
+    ("LLM calls", "llm_calls", 9, ".1f"),
+    ("overhead ms", "overhead_ms", 11, ".1f"),
+    ("peak RSS MB", "peak_rss_mb", 11, ".0f"),
+    ("calls/s", "throughput", 9, ".1f"),
+]
+
+
+def print_table(rows, latency):
+    name_title, _, name_width, _ = COLUMNS[0]
+    header = f"{name_title:<{name_width}} " + " ".join(
+        f"{title:>{width}}" for title, _, width, _ in COLUMNS[1:]
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        name = f"{row['framework']:<{name_width}} "
+        if "error" in row:
+            print(name + row["error"])
+            continue
+        print(
+            name
+            + " ".join(
+                f"{row[key]:>{width}{fmt}}" for _, key, width, fmt in COLUMNS[1:]
+            )
+        )
+    print(
+        f"\nStub latency {latency * 1000:.0f} ms per LLM call. "
+        "overhead = call ms - LLM calls x stub latency."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-framework overhead benchmark")
+    parser.add_argument(
+        "--frameworks", nargs="+", choices=list(FRAMEWORKS), default=list(FRAMEWORKS)
+    )
+    parser.add_argument("--calls", type=int, default=50, help="Calls per phase")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub seconds")
+    parser.add_argument("--json", metavar="PATH", help="Also save results as JSON")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker, args.base_url, args.calls, args.concurrency)
+        print(json.dumps(result))
+        return
+
+    server = start_stub_server(latency=args.latency)
+    port = server.server_address[1]
+    print(f"🏁 Benchmarking {len(args.frameworks)} frameworks against a local stub")
+    print("=" * 50)
+
+    rows = []
+    for name in args.frameworks:
+        print(f"⏳ {name}...", flush=True)
+        base_url = f"http://127.0.0.1:{port}/{name}/v1"
+        proc = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--worker",
+                name,
+                "--base-url",
+                base_url,
+                "--calls",
+                str(args.calls),
+                "--concurrency",
+                str(args.concurrency),
+            ],
+            env=worker_env(base_url),
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            error = (proc.stderr.strip().splitlines() or ["failed"])[-1]
+            rows.append({"framework": name, "error": error})
+            continue
+
+        row = json.loads(proc.stdout.strip().splitlines()[-1])
+        # Warm-up + sequential + concurrent phases
+        runs = 1 + 2 * args.calls
+        row["llm_calls"] = server.request_counts.get(name, 0) / runs
+        row["overhead_ms"] = row["call_ms"] - row["llm_calls"] * args.latency * 1000
+        rows.append(row)
+
+    server.shutdown()
+    print()
+    print_table(rows, args.latency)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"💾 Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
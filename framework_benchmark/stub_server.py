@@ -0,0 +1,171 @@
+# python3.10 stub_server.py --port 8000 --latency 0.05
+"""
+Local OpenAI-compatible stub server with fixed responses and fixed latency.
+
+Point any OpenAI client at ``http://127.0.0.1:<port>/<profile>/v1``. The
+``<profile>`` path segment picks the canned reply (some frameworks need their
+own answer format to finish a run) and is also used to count requests per
+client. ``/v1`` on its own uses the default reply.
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = "Thought: I now can give a great answer\nFinal Answer: Hello, World!"
+
+# Replies for frameworks that parse the model output in their own format
+PROFILE_REPLIES = {
+    # CodeAgent only finishes once the model calls final_answer() in code
+    "smolagents": (
+        "Thought: I can answer directly.\n"
+        '<code>\nfinal_answer("Hello, World!")\n</code>'
+    ),
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like a real provider
+    # Headers and body go out in separate writes; without this, Nagle's
+    # algorithm plus delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def _profile(self):
+        parts = [p for p in self.path.split("/") if p]
+        return parts[0] if parts and parts[0] != "v1" else "default"
+
+    def _send(self, status, body: bytes, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            body = {
+                "object": "list",
+                "data": [{"id": "gpt-4o-mini", "object": "model"}],
+            }
+            self._send(200, json.dumps(body).encode())
+        elif self.path == "/stats":
+            self._send(200, json.dumps(self.server.request_counts).encode())
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, b'{"error": "not found"}')
+            return
+
+        profile = self._profile()
+        with self.server.lock:
+            counts = self.server.request_counts
+            counts[profile] = counts.get(profile, 0) + 1
+
+        time.sleep(self.server.latency)
+        reply = PROFILE_REPLIES.get(profile, DEFAULT_REPLY)
+        model = request.get("model", "gpt-4o-mini")
+        if request.get("stream"):
+            include_usage = (request.get("stream_options") or {}).get("include_usage")
+            self._send(
+                200,
+                stream_body(model, reply, include_usage),
+                "text/event-stream",
+            )
+        else:
+            self._send(200, json.dumps(completion(model, reply)).encode())
+
+
+def _usage(reply):
+    completion_tokens = len(reply.split())
+    return {
+        "prompt_tokens": 10,
+        "completion_tokens": completion_tokens,
+        "total_tokens": 10 + completion_tokens,
+    }
+
+
+def completion(model, reply):
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": _usage(reply),
+    }
+
+
+def stream_body(model, reply, include_usage=False) -> bytes:
+    """The whole SSE stream for one reply, split into a few content chunks."""
+    base = {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+    }
+    words = reply.split(" ")
+    pieces = [w + (" " if i < len(words) - 1 else "") for i, w in enumerate(words)]
+    deltas = [{"role": "assistant", "content": ""}] + [{"content": p} for p in pieces]
+
+    events = []
+    for delta in deltas:
+        choice = {"index": 0, "delta": delta, "finish_reason": None}
+        events.append({**base, "choices": [choice]})
+    events.append(
+        {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    )
+    if include_usage:
+        events.append({**base, "choices": [], "usage": _usage(reply)})
+
+    lines = [f"data: {json.dumps(event)}\n\n" for event in events]
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode()
+
+
+def make_stub_server(host="127.0.0.1", port=0, latency=0.05):
+    """Create the stub server; port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.lock = threading.Lock()
+    server.request_counts = {}
+    return server
+
+
+def start_stub_server(host="127.0.0.1", port=0, latency=0.05):
+    """Start the stub in a background thread."""
+    server = make_stub_server(host, port, latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds")
+    args = parser.parse_args()
+
+    server = make_stub_server(args.host, args.port, args.latency)
+    print(f"🧪 Stub server on http://{args.host}:{args.port}/v1 ({args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
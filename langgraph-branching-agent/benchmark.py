@@ -0,0 +1,213 @@
+# python3.10 benchmark.py --messages 100000
+# python3.10 benchmark.py --import-time
+"""
+Measure routing throughput (messages/sec) for the branching workflow.
+
+Compares the original keyword router with the compiled rule table, and
+one-at-a-time ``workflow.invoke`` with the ``batch`` / ``abatch`` entry points.
+With ``--import-time`` it instead measures worker cold start: importing
+``main`` versus importing it and building everything up front, as the
+module used to do at import time.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import main
+
+SAMPLE_MESSAGES = [
+    "Summarize the quarterly sales data for the last year.",
+    "There is a critical error in the database system.",
+    "URGENT: customers cannot log in to the portal",
+    "What are the main findings from the recent market research report and how "
+    "do they compare to last quarter?",
+    "Please reset my password",
+    "Can you pull together a detailed comparison of the three vendor proposals "
+    "including pricing, support terms, delivery timelines and risks?",
+]
+
+
+def legacy_decision_router(input_text: str) -> str:
+    """The original router, kept as the baseline."""
+    if "urgent" in input_text.lower() or "error" in input_text.lower():
+        return "escalation"
+    elif len(input_text.split()) > 12:
+        return "analysis"
+    else:
+        return "research"
+
+
+def keyword_loop_router(input_text: str, rules) -> str:
+    """The original approach generalized to a rule table: one check per keyword."""
+    lowered = input_text.lower()
+    for route, keywords in rules:
+        for keyword in keywords:
+            if keyword in lowered:
+                return route
+    if len(input_text.split()) > main.LONG_INPUT_WORDS:
+        return main.LONG_INPUT_ROUTE
+    return main.DEFAULT_ROUTE
+
+
+def large_rule_table(n_keywords, seed=0):
+    """A realistic-size table: many product/incident keywords per route."""
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8))
+        for _ in range(n_keywords)
+    ]
+    half = n_keywords // 2
+    return [
+        ("escalation", ["urgent", "error"] + words[:half]),
+        ("analysis", words[half:]),
+    ]
+
+
+def make_messages(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.choice(SAMPLE_MESSAGES) for _ in range(n)]
+
+
+def timed(label, n, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {n / elapsed:>12,.0f} msg/s  ({elapsed:.2f}s)")
+
+
+def import_benchmark(runs):
+    """Time fresh interpreters importing the router module."""
+    here = Path(__file__).resolve().parent
+    scenarios = [
+        ("import main (lazy)", "import main"),
+        (
+            "import + compile + diagram (old)",
+            "import main; main.VERBOSE = False; "
+            "main.get_workflow(); main.save_mermaid('workflow_graph.mmd')",
+        ),
+    ]
+    env = {**os.environ, "PYTHONPATH": str(here)}
+
+    print("🧊 Worker cold-start benchmark")
+    print("=" * 50)
+    for label, code in scenarios:
+        timings = []
+        for _ in range(runs):
+            # Run from an empty directory so any file written at import shows up
+            with tempfile.TemporaryDirectory() as cwd:
+                start = time.perf_counter()
+                subprocess.run(
+                    [sys.executable, "-c", code],
+                    cwd=cwd,
+                    env=env,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                )
+                timings.append(time.perf_counter() - start)
+                written = sorted(os.listdir(cwd))
+        print(
+            f"{label:<36} median {statistics.median(timings) * 1000:>7.1f} ms"
+            f"  files written: {written or 'none'}"
+        )
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description="Benchmark workflow routing")
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument(
+        "--graph-messages",
+        type=int,
+        default=10_000,
+        help="Messages to push through the full graph (slower than the router)",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="Measure worker cold start instead of routing throughput",
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Runs per import test")
+    parser.add_argument(
+        "--keywords",
+        type=int,
+        default=200,
+        help="Keywords in the large rule table comparison",
+    )
+    args = parser.parse_args()
+
+    if args.import_time:
+        import_benchmark(args.runs)
+        return
+
+    main.VERBOSE = False
+    messages = make_messages(args.messages)
+    graph_messages = messages[: args.graph_messages]
+
+    # Both routers must agree before comparing their speed
+    mismatches = sum(
+        legacy_decision_router(m) != main.route_message(m) for m in SAMPLE_MESSAGES
+    )
+    assert mismatches == 0, "compiled router disagrees with the legacy router"
+
+    print("🏁 Routing benchmark")
+    print("=" * 50)
+    timed(
+        "legacy router",
+        len(messages),
+        lambda: [legacy_decision_router(m) for m in messages],
+    )
+    timed(
+        "compiled router",
+        len(messages),
+        lambda: [main.route_message(m) for m in messages],
+    )
+
+    rules = large_rule_table(args.keywords)
+    default_rules = main.ROUTING_RULES
+    main.configure_routing(rules)
+    timed(
+        f"keyword loop ({args.keywords} keywords)",
+        len(messages),
+        lambda: [keyword_loop_router(m, rules) for m in messages],
+    )
+    timed(
+        f"compiled router ({args.keywords} keywords)",
+        len(messages),
+        lambda: [main.route_message(m) for m in messages],
+    )
+    main.configure_routing(default_rules)
+
+    # Start each graph run with an empty node cache so they're comparable
+    workflow = main.get_workflow()
+    main.NODE_CACHE.clear()
+    timed(
+        "workflow.invoke (one at a time)",
+        len(graph_messages),
+        lambda: [workflow.invoke({"input": m, "result": ""}) for m in graph_messages],
+    )
+    main.NODE_CACHE.clear()
+    timed(
+        "route_batch",
+        len(graph_messages),
+        lambda: main.route_batch(graph_messages, batch_size=args.batch_size),
+    )
+    main.NODE_CACHE.clear()
+    timed(
+        "aroute_batch",
+        len(graph_messages),
+        lambda: asyncio.run(
+            main.aroute_batch(graph_messages, batch_size=args.batch_size)
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -1,6 +1,42 @@
+import argparse
+import functools
+import hashlib
+import re
+import sqlite3
+from contextlib import nullcontext
 from typing import TypedDict
 
-from langgraph.graph import END, START, StateGraph
+from node_cache import NodeCache
+
+try:
+    # Optional tracing: run with PYTHONPATH=../agent_tracing to enable it
+    from tracer import AGENT, GRAPH_NODE, span, traced
+except ImportError:
+    AGENT = GRAPH_NODE = None
+
+    def span(name, category=None, **attrs):
+        return nullcontext()
+
+    def traced(category=None, name=None):
+        return lambda func: func
+
+
+# Set to False to silence per-message logging (e.g. for batch runs)
+VERBOSE = True
+
+# Routing rules, checked in priority order: the first route whose keywords
+# appear anywhere in the input (case-insensitive) wins.
+ROUTING_RULES = [
+    ("escalation", ["urgent", "error"]),
+]
+# Inputs longer than this many words go to LONG_INPUT_ROUTE
+LONG_INPUT_WORDS = 12
+LONG_INPUT_ROUTE = "analysis"
+DEFAULT_ROUTE = "research"
+ROUTES = ("research", "analysis", "escalation")
+
+# Shared by every workflow in this process; duplicate tickets skip node work
+NODE_CACHE = NodeCache(maxsize=10_000, ttl=3600)
 
 
 # Define state structure
@@ -9,73 +45,321 @@ class State(TypedDict):
     result: str
 
 
+def log(message: str) -> None:
+    if VERBOSE:
+        print(message)
+
+
+def _trie_pattern(words):
+    """Build a regex in which keywords sharing a prefix share a branch."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # End of a keyword
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy optional tail: prefer the longest keyword at a position
+        return f"(?:{body})?" if "" in node else body
+
+    return re.compile(emit(trie))
+
+
+def compile_rules(rules):
+    """Compile a rule table into one matcher over lowercased text.
+
+    Returns the trie-shaped regex and a map from each keyword to the best
+    (lowest) rule priority it implies. The scan cost grows with the input
+    length rather than with the number of keywords.
+    """
+    ranks = {}
+    for rank, (route, keywords) in enumerate(rules):
+        if route not in ROUTES:
+            raise ValueError(f"Unknown route {route!r}; expected one of {ROUTES}")
+        for keyword in keywords:
+            if keyword:
+                ranks.setdefault(keyword.lower(), rank)
+    if not ranks:
+        return None, {}
+    # Matching a keyword means every keyword inside it matched too
+    ranks = {
+        keyword: min(r for other, r in ranks.items() if other in keyword)
+        for keyword in ranks
+    }
+    return _trie_pattern(ranks), ranks
+
+
+# (rules, matcher, keyword ranks) as one tuple, replaced by a single
+# assignment: workflow.batch routes on worker threads, which must never pair
+# a new rank with the old rule list
+_routing = (ROUTING_RULES, *compile_rules(ROUTING_RULES))
+
+
+def configure_routing(rules=None, long_input_words=None):
+    """Replace the routing rule table and/or the long-input word limit."""
+    global ROUTING_RULES, LONG_INPUT_WORDS, _routing
+    if rules is not None:
+        rules = list(rules)
+        _routing = (rules, *compile_rules(rules))
+        ROUTING_RULES = rules
+    if long_input_words is not None:
+        LONG_INPUT_WORDS = long_input_words
+
+
+def route_message(input_text: str) -> str:
+    """Pick the node for a message using the compiled rule table."""
+    rules, matcher, keyword_ranks = _routing
+    if matcher is not None:
+        lowered = input_text.lower()
+        match = matcher.search(lowered)
+        if match is not None:
+            best = keyword_ranks[match.group()]
+            # A later keyword may belong to a higher-priority rule
+            while best and match is not None:
+                match = matcher.search(lowered, match.start() + 1)
+                if match is not None:
+                    best = min(best, keyword_ranks[match.group()])
+            return rules[best][0]
+    # maxsplit stops splitting as soon as the input is known to be long
+    if len(input_text.split(maxsplit=LONG_INPUT_WORDS)) > LONG_INPUT_WORDS:
+        return LONG_INPUT_ROUTE
+    return DEFAULT_ROUTE
+
+
 # Define our possible nodes (tasks)
+@traced(GRAPH_NODE, "research")
+@NODE_CACHE.cached("research")
 def research_node(state: State) -> State:
-    print("Research node: Gathering information...")
+    log("Research node: Gathering information...")
     state["result"] = "Here is the research report."
     return state
 
 
+@traced(GRAPH_NODE, "analysis")
+@NODE_CACHE.cached("analysis")
 def analysis_node(state: State) -> State:
-    print("Analysis node: Analyzing data...")
+    log("Analysis node: Analyzing data...")
     state["result"] = "Here is the analysis summary."
     return state
 
 
+@traced(GRAPH_NODE, "escalation")
+@NODE_CACHE.cached("escalation")
 def escalation_node(state: State) -> State:
-    print("Escalation node: Escalating to human expert...")
+    log("Escalation node: Escalating to human expert...")
     state["result"] = "Escalated to human expert for further review."
     return state
 
 
 # Decision function: routes input to the right node
+@traced(GRAPH_NODE, "decision_router")
 def decision_router(state: State) -> str:
     input_text = state["input"]
-    print(f"Routing based on input: '{input_text}'")
-    # Simple rules for demonstration
-    if "urgent" in input_text.lower() or "error" in input_text.lower():
-        return "escalation"
-    elif len(input_text.split()) > 12:
-        return "analysis"
-    else:
-        return "research"
+    log(f"Routing based on input: '{input_text}'")
+    return route_message(input_text)
+
 
+def build_graph():
+    """Define the workflow graph (not compiled)."""
+    # Imported here so importing this module (e.g. just for route_message)
+    # doesn't pay for loading LangGraph
+    from langgraph.graph import END, START, StateGraph
 
-# Define the workflow graph
-graph = StateGraph(State)
+    graph = StateGraph(State)
 
-# Add nodes
-graph.add_node("research", research_node)
-graph.add_node("analysis", analysis_node)
-graph.add_node("escalation", escalation_node)
+    # Add nodes
+    graph.add_node("research", research_node)
+    graph.add_node("analysis", analysis_node)
+    graph.add_node("escalation", escalation_node)
 
-# Add conditional edges from START
-graph.add_conditional_edges(
-    START,
-    decision_router,
-    {"research": "research", "analysis": "analysis", "escalation": "escalation"},
-)
+    # Add conditional edges from START
+    graph.add_conditional_edges(
+        START,
+        decision_router,
+        {route: route for route in ROUTES},
+    )
 
-# Connect all nodes to END
-graph.add_edge("research", END)
-graph.add_edge("analysis", END)
-graph.add_edge("escalation", END)
+    # Connect all nodes to END
+    graph.add_edge("research", END)
+    graph.add_edge("analysis", END)
+    graph.add_edge("escalation", END)
+    return graph
 
-# Compile the graph
-workflow = graph.compile()
 
-# Visualize the graph
-graph_representation = workflow.get_graph()
+@functools.cache
+def get_workflow(checkpoint_db=None):
+    """Compile the graph on first use; later calls reuse the same workflow.
 
-# Save Mermaid diagram to file
-mermaid_diagram = graph_representation.draw_mermaid()
-with open("workflow_graph.mmd", "w") as f:
-    f.write(mermaid_diagram)
-print("Mermaid diagram saved to workflow_graph.mmd")
+    With ``checkpoint_db`` the workflow saves a checkpoint after every step
+    to that SQLite file, so runs can be inspected or resumed by thread ID.
+    """
+    if checkpoint_db is None:
+        return build_graph().compile()
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    conn = sqlite3.connect(checkpoint_db, check_same_thread=False)
+    return build_graph().compile(checkpointer=SqliteSaver(conn))
+
+
+def save_mermaid(path="workflow_graph.mmd"):
+    """Render the workflow as a Mermaid diagram for debugging."""
+    mermaid_diagram = get_workflow().get_graph().draw_mermaid()
+    with open(path, "w") as f:
+        f.write(mermaid_diagram)
+    print(f"Mermaid diagram saved to {path}")
+
+
+def _chunks(messages, batch_size):
+    batch = []
+    for message in messages:
+        batch.append({"input": message, "result": ""})
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def route_batch(
+    messages, batch_size=1000, max_concurrency=None, checkpoint_db=None, run_id=None
+):
+    """Run many messages through the workflow with ``workflow.batch``.
+
+    Messages are consumed lazily in chunks of ``batch_size`` so large ticket
+    streams never have to be materialized as graph inputs all at once.
+
+    With ``checkpoint_db`` and ``run_id``, message ``i`` runs on thread
+    ``{run_id}:{i}:{hash of the message}``. Re-running the same batch with the
+    same ``run_id`` after a crash returns finished messages from their
+    checkpoints and resumes interrupted ones instead of starting over. Lines
+    that were edited since get a new thread and are routed again.
+    """
+    if run_id is not None and checkpoint_db is None:
+        raise ValueError("run_id needs a checkpoint_db to resume from")
+    if checkpoint_db is not None and run_id is None:
+        raise ValueError("checkpoint_db needs a run_id to name its threads")
+    workflow = get_workflow(checkpoint_db)
+    config = {"max_concurrency": max_concurrency} if max_concurrency else None
+    results = []
+    for batch in _chunks(messages, batch_size):
+        # One root span per chunk; node spans from the batch threads nest in it
+        with span("route_batch", AGENT, messages=len(batch)):
+            if run_id is None:
+                results.extend(workflow.batch(batch, config=config))
+            else:
+                offset = len(results)
+                results.extend(_resume_batch(workflow, batch, run_id, offset, config))
+    return results
+
+
+def _thread_id(run_id, index, message):
+    digest = hashlib.sha256(message.encode()).hexdigest()[:16]
+    return f"{run_id}:{index}:{digest}"
+
+
+def _resume_batch(workflow, batch, run_id, offset, config):
+    configs = [
+        {
+            **(config or {}),
+            "configurable": {
+                "thread_id": _thread_id(run_id, offset + i, state["input"])
+            },
+        }
+        for i, state in enumerate(batch)
+    ]
+    results = [None] * len(batch)
+    pending = []
+    for i, thread_config in enumerate(configs):
+        snapshot = workflow.get_state(thread_config)
+        if snapshot.values and not snapshot.next:
+            results[i] = snapshot.values  # Finished before the crash
+        else:
+            # None continues from the last checkpoint of an interrupted run
+            pending.append((i, None if snapshot.next else batch[i]))
+    if pending:
+        outputs = workflow.batch(
+            [inp for _, inp in pending], [configs[i] for i, _ in pending]
+        )
+        for (i, _), output in zip(pending, outputs):
+            results[i] = output
+    return results
+
+
+async def aroute_batch(messages, batch_size=1000, max_concurrency=None):
+    """Async counterpart of ``route_batch`` built on ``workflow.abatch``.
+
+    Runs without a checkpointer: the SQLite checkpointer is synchronous.
+    """
+    workflow = get_workflow()
+    config = {"max_concurrency": max_concurrency} if max_concurrency else None
+    results = []
+    for batch in _chunks(messages, batch_size):
+        with span("aroute_batch", AGENT, messages=len(batch)):
+            results.extend(await workflow.abatch(batch, config=config))
+    return results
 
 
 # Example runs
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the branching workflow")
+    parser.add_argument(
+        "--diagram",
+        nargs="?",
+        const="workflow_graph.mmd",
+        metavar="PATH",
+        help="Save a Mermaid diagram of the workflow (default: workflow_graph.mmd)",
+    )
+    parser.add_argument(
+        "--batch", metavar="FILE", help="Route every line of FILE as one message"
+    )
+    parser.add_argument(
+        "--checkpoint-db",
+        metavar="PATH",
+        help="Checkpoint batch runs to this SQLite file",
+    )
+    parser.add_argument(
+        "--run-id",
+        help="Thread ID prefix; rerun with the same ID to resume a batch",
+    )
+    args = parser.parse_args()
+
+    if args.diagram:
+        save_mermaid(args.diagram)
+
+    if args.batch:
+        VERBOSE = False
+        with open(args.batch) as f:
+            messages = [line.strip() for line in f if line.strip()]
+        if args.checkpoint_db and not args.run_id:
+            args.run_id = args.batch
+        results = route_batch(
+            messages, checkpoint_db=args.checkpoint_db, run_id=args.run_id
+        )
+        counts = {}
+        for result in results:
+            counts[result["result"]] = counts.get(result["result"], 0) + 1
+        print(f"Routed {len(results)} messages:")
+        for outcome, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+            print(f"  {count:>8}  {outcome}")
+        stats = NODE_CACHE.stats()
+        print(
+            f"Node cache: {stats['total']['hit_rate']:.1%} hit rate, "
+            f"{stats['size']} entries, {stats['evictions']} evicted, "
+            f"{stats['expirations']} expired"
+        )
+        for node, node_stats in stats["nodes"].items():
+            print(
+                f"  {node:<12} {node_stats['hits']:>8} hits "
+                f"{node_stats['misses']:>8} misses  ({node_stats['hit_rate']:.1%})"
+            )
+        raise SystemExit
+
     test_inputs = [
         {
             "input": "Summarize the quarterly sales data for the last year.",
@@ -89,5 +373,6 @@ if __name__ == "__main__":
     ]
     for inp in test_inputs:
         print("\n--- New Run ---")
-        result = workflow.invoke(inp)
+        with span("workflow.invoke", AGENT):
+            result = get_workflow().invoke(inp)
         print("Final Result:", result["result"])
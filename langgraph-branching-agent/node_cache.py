@@ -0,0 +1,104 @@
+# Node Result Cache (in-process LRU with TTL)
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class NodeCache:
+    """LRU cache of node outputs keyed on a hash of the node's input state.
+
+    Entries expire ``ttl`` seconds after they were stored, and the least
+    recently used entry is evicted once ``maxsize`` is reached. Safe to share
+    between the threads ``workflow.batch`` runs nodes on.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = {}
+        self._misses = {}
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(node: str, state: dict) -> str:
+        payload = json.dumps(state, sort_keys=True, default=str)
+        return hashlib.sha256(f"{node}\0{payload}".encode()).hexdigest()
+
+    def get(self, node: str, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits[node] = self._hits.get(node, 0) + 1
+                    return dict(value)
+                del self._entries[key]
+                self.expirations += 1
+            self._misses[node] = self._misses.get(node, 0) + 1
+            return None
+
+    def put(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits.clear()
+            self._misses.clear()
+            self.evictions = 0
+            self.expirations = 0
+
+    def cached(self, node: str):
+        """Decorator that serves a node's output from the cache when possible."""
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(state):
+                key = self.make_key(node, state)
+                result = self.get(node, key)
+                if result is None:
+                    result = func(dict(state))
+                    self.put(key, result)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict:
+        """Hit/miss counts per node and overall."""
+        with self._lock:
+            nodes = sorted(set(self._hits) | set(self._misses))
+            per_node = {
+                node: _rate(self._hits.get(node, 0), self._misses.get(node, 0))
+                for node in nodes
+            }
+            total = _rate(sum(self._hits.values()), sum(self._misses.values()))
+            return {
+                "size": len(self._entries),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "total": total,
+                "nodes": per_node,
+            }
+
+
+def _rate(hits: int, misses: int) -> dict:
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+    }
@@ -0,0 +1,144 @@
+# Disk-backed LRU Store (SQLite)
+import sqlite3
+import threading
+import time
+
+
+class DiskLRUCache:
+    """Response cache in a single SQLite file, with TTL and size limits.
+
+    Entries expire ``ttl`` seconds after they were stored. When the stored
+    bodies exceed ``max_bytes`` (or ``max_entries``), the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        path: str = "llm_cache.sqlite",
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                body BLOB,
+                content_type TEXT,
+                size INTEGER,
+                created_at REAL,
+                accessed_at REAL,
+                upstream_latency REAL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+        )
+        self._conn.commit()
+        self._total_bytes, self._count = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries"
+        ).fetchone()
+
+    def get(self, key: str):
+        """Return ``(body, content_type, upstream_latency)`` or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, content_type, size, created_at, upstream_latency "
+                "FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            body, content_type, size, created_at, upstream_latency = row
+            if created_at + self.ttl <= now:
+                self._delete(key, size)
+                self.expirations += 1
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return body, content_type, upstream_latency
+
+    def put(self, key: str, body: bytes, content_type: str, upstream_latency: float):
+        if len(body) > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if old is not None:
+                self._delete(key, old[0])
+            self._conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, content_type, len(body), now, now, upstream_latency),
+            )
+            self._total_bytes += len(body)
+            self._count += 1
+            self._evict()
+            self._conn.commit()
+
+    def _delete(self, key, size):
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._total_bytes -= size
+        self._count -= 1
+
+    def _evict(self):
+        # Oldest-accessed first, in small batches to keep each pass cheap
+        while self._total_bytes > self.max_bytes or (
+            self.max_entries is not None and self._count > self.max_entries
+        ):
+            victims = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 32"
+            ).fetchall()
+            if not victims:
+                break
+            for key, size in victims:
+                self._delete(key, size)
+                self.evictions += 1
+                if self._total_bytes <= self.max_bytes and (
+                    self.max_entries is None or self._count <= self.max_entries
+                ):
+                    break
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry; returns how many were removed."""
+        with self._lock:
+            cutoff = time.time() - self.ttl
+            removed = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries "
+                "WHERE created_at <= ?",
+                (cutoff,),
+            ).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE created_at <= ?", (cutoff,))
+            self._conn.commit()
+            self._count -= removed[0]
+            self._total_bytes -= removed[1]
+            self.expirations += removed[0]
+            return removed[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": self._count,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
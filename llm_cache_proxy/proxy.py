@@ -0,0 +1,278 @@
+# python3.10 proxy.py --upstream https://api.openai.com/v1 --port 8787
+"""
+Local OpenAI-compatible caching proxy.
+
+Point any example at it with ``OPENAI_BASE_URL=http://127.0.0.1:8787/v1``.
+Identical requests (same model, messages, tools, response schema and sampling
+settings) are answered from a disk-backed LRU cache instead of the provider;
+streamed responses are stored as their raw SSE stream and replayed as-is.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from cache_store import DiskLRUCache
+
+# Endpoints whose responses depend only on the request body
+CACHEABLE_ENDPOINTS = ("/chat/completions", "/completions", "/embeddings")
+
+# Bookkeeping fields that change neither the model's answer nor what the
+# response contains (stream_options can add a usage chunk, so it stays in)
+IGNORED_FIELDS = {"user", "metadata", "store"}
+
+
+def _normalize(value):
+    """Drop nulls and collapse text-only content parts into plain strings."""
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        if value and all(
+            isinstance(part, dict) and part.get("type") == "text" and len(part) == 2
+            for part in value
+        ):
+            return "".join(part["text"] for part in value)
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(endpoint: str, body: dict) -> str:
+    """Key for a request: the endpoint plus its normalized, sorted JSON body.
+
+    Covers model, messages, tools/tool_choice, response_format (the response
+    schema) and sampling settings. ``stream`` stays in the key because
+    streamed and non-streamed responses are stored in different formats.
+    """
+    request = {k: v for k, v in body.items() if k not in IGNORED_FIELDS}
+    request["stream"] = bool(request.get("stream"))
+    payload = json.dumps(
+        [endpoint, _normalize(request)], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ProxyStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.latency_saved = 0.0
+        self.upstream_time = 0.0
+
+    def record(self, outcome, latency=0.0):
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+                self.latency_saved += latency
+            elif outcome == "miss":
+                self.misses += 1
+                self.upstream_time += latency
+            else:
+                self.bypassed += 1
+                self.upstream_time += latency
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "latency_saved_s": round(self.latency_saved, 3),
+                "upstream_time_s": round(self.upstream_time, 3),
+            }
+
+
+class CachingProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    _sessions = threading.local()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    @property
+    def session(self):
+        # One keep-alive session to the provider per handler thread
+        if not hasattr(self._sessions, "session"):
+            self._sessions.session = requests.Session()
+        return self._sessions.session
+
+    def _endpoint(self):
+        # Accept both /v1/chat/completions and /chat/completions
+        path = self.path.split("?", 1)[0]
+        return path[3:] if path.startswith("/v1/") else path
+
+    def _upstream_headers(self):
+        headers = {"Content-Type": "application/json"}
+        for name in ("Authorization", "OpenAI-Organization", "OpenAI-Project"):
+            if self.headers.get(name):
+                headers[name] = self.headers[name]
+        return headers
+
+    def _send(self, status, body: bytes, content_type, cache_status=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if cache_status:
+            self.send_header("X-Cache", cache_status)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_upstream_error(self, error):
+        body = {"error": {"message": f"Upstream request failed: {error}"}}
+        self._send(502, json.dumps(body).encode(), "application/json")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            stats = {**self.server.stats.snapshot(), **self.server.cache.stats()}
+            self._send(200, json.dumps(stats, indent=2).encode(), "application/json")
+            return
+        start = time.perf_counter()
+        try:
+            response = self.session.get(
+                self.server.upstream + self._endpoint(),
+                headers=self._upstream_headers(),
+                timeout=self.server.upstream_timeout,
+            )
+        except requests.RequestException as e:
+            self._send_upstream_error(e)
+            return
+        self.server.stats.record("bypass", time.perf_counter() - start)
+        self._send(
+            response.status_code,
+            response.content,
+            response.headers.get("Content-Type", "application/json"),
+        )
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        endpoint = self._endpoint()
+        try:
+            body = json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            body = None
+
+        cacheable = isinstance(body, dict) and endpoint in CACHEABLE_ENDPOINTS
+        no_cache = "no-cache" in self.headers.get("Cache-Control", "")
+        key = cache_key(endpoint, body) if cacheable else None
+
+        if cacheable and not no_cache:
+            cached = self.server.cache.get(key)
+            if cached is not None:
+                cached_body, content_type, upstream_latency = cached
+                self.server.stats.record("hit", upstream_latency)
+                self._send(200, cached_body, content_type, "HIT")
+                return
+
+        start = time.perf_counter()
+        stream = cacheable and bool(body.get("stream"))
+        try:
+            response = self.session.post(
+                self.server.upstream + endpoint,
+                data=raw,
+                headers=self._upstream_headers(),
+                stream=stream,
+                timeout=self.server.upstream_timeout,
+            )
+        except requests.RequestException as e:
+            self._send_upstream_error(e)
+            return
+        content_type = response.headers.get("Content-Type", "application/json")
+        lookup = cacheable and not no_cache
+        cache_status = "MISS" if lookup else "BYPASS"
+
+        if stream and response.status_code == 200:
+            # Pass the stream through as it arrives while recording it
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("X-Cache", cache_status)
+            self.end_headers()
+            recorded = []
+            try:
+                for chunk in response.iter_content(chunk_size=None):
+                    recorded.append(chunk)
+                    self._write_chunk(chunk)
+                self.wfile.write(b"0\r\n\r\n")
+            except (OSError, requests.RequestException):
+                # The client hung up or the upstream stream broke off; the
+                # recording is incomplete, so it is not cached
+                self.close_connection = True
+                return
+            finally:
+                # Hands the upstream connection back to the session's pool
+                response.close()
+            content = b"".join(recorded)
+        else:
+            content = response.content
+            self._send(response.status_code, content, content_type, cache_status)
+
+        latency = time.perf_counter() - start
+        self.server.stats.record("miss" if lookup else "bypass", latency)
+        if cacheable and response.status_code == 200:
+            self.server.cache.put(key, content, content_type, latency)
+
+
+def make_proxy_server(upstream, cache, host="127.0.0.1", port=8787, verbose=False):
+    server = ThreadingHTTPServer((host, port), CachingProxyHandler)
+    server.daemon_threads = True
+    server.upstream = upstream.rstrip("/")
+    server.cache = cache
+    server.stats = ProxyStats()
+    server.upstream_timeout = 600
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local caching LLM proxy")
+    parser.add_argument(
+        "--upstream",
+        default=os.environ.get("LLM_PROXY_UPSTREAM", "https://api.openai.com/v1"),
+        help="Provider base URL (e.g. https://api.x.ai/v1 for Grok)",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--db", default="llm_cache.sqlite", help="Cache file")
+    parser.add_argument("--ttl", type=float, default=7 * 24 * 3600, help="Seconds")
+    parser.add_argument("--max-mb", type=float, default=512, help="Cache size limit")
+    parser.add_argument("--max-entries", type=int, help="Cache entry limit")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    cache = DiskLRUCache(
+        args.db,
+        max_bytes=int(args.max_mb * 1024 * 1024),
+        ttl=args.ttl,
+        max_entries=args.max_entries,
+    )
+    purged = cache.purge_expired()
+    server = make_proxy_server(
+        args.upstream, cache, args.host, args.port, verbose=args.verbose
+    )
+    print(f"🗄️  Caching proxy on http://{args.host}:{args.port}/v1 → {args.upstream}")
+    print(f"   Cache: {args.db} ({cache.stats()['entries']} entries, {purged} expired)")
+    print(f"   Stats: http://{args.host}:{args.port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps({**server.stats.snapshot(), **cache.stats()}, indent=2))
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
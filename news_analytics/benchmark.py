@@ -0,0 +1,197 @@
+# python3.10 benchmark.py --articles 1000000
+"""
+Counting articles per source and sentiment per day over a synthetic
+``news.db``: row by row through ``NewsDatabase`` (as the analyzer does), as a
+SQLite ``GROUP BY``, and from the memory-mapped Parquet export.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow as pa
+from export import export
+from snapshot import NewsSnapshot
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "pydantic_ai_example"))
+sys.path.insert(0, str(ROOT / "type_safe_news_agent"))
+# news_analyzer builds its agents at import time; they are never called here
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+from database import init_db  # noqa: E402
+from news_analyzer import NewsDatabase  # noqa: E402
+
+SOURCES = [f"https://feeds.example{i}.com/rss.xml" for i in range(20)]
+SENTIMENTS = ["positive", "negative", "neutral"]
+TOPICS = ["politics", "business", "technology", "health", "sports", "science"]
+
+
+def populate(n_articles, days, first_id=1, analyzed_share=0.8, seed=0):
+    """Insert synthetic articles (oldest first) and analysis rows into news.db."""
+    rng = random.Random(seed + first_id)
+    end = datetime.now(timezone.utc)
+    step = timedelta(days=days) / max(n_articles, 1)
+    start = end - timedelta(days=days)
+    news, analysis = [], []
+    for i in range(n_articles):
+        news_id = first_id + i
+        published = start + step * i
+        news.append(
+            (
+                news_id,
+                f"Story {news_id}",
+                f"https://news.example.com/{news_id}",
+                "A short summary of the story. " * 4,
+                published.isoformat(),
+                rng.choice(SOURCES),
+            )
+        )
+        if rng.random() < analyzed_share:
+            analyzed = (published + timedelta(minutes=5)).astimezone()
+            analysis.append(
+                (
+                    news_id,
+                    rng.choice(SENTIMENTS),
+                    rng.random(),
+                    rng.choice(TOPICS),
+                    json.dumps(["alpha", "beta"]),
+                    "One sentence summary.",
+                    json.dumps(["point one", "point two"]),
+                    rng.randint(1, 10),
+                    analyzed.replace(tzinfo=None).isoformat(),
+                    300.0,
+                    2.5,
+                )
+            )
+    conn = sqlite3.connect("news.db")
+    conn.executemany("INSERT INTO news VALUES (?, ?, ?, ?, ?, ?)", news)
+    conn.executemany(
+        "INSERT INTO analysis VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", analysis
+    )
+    conn.commit()
+    conn.close()
+
+
+def row_by_row(n_articles):
+    db = NewsDatabase()
+    articles = db.get_recent_articles(limit=n_articles)
+    return Counter(article.source for article in articles)
+
+
+def sqlite_group_by():
+    conn = sqlite3.connect("news.db")
+    by_source = conn.execute(
+        "SELECT source, COUNT(*) FROM news GROUP BY source ORDER BY 2 DESC"
+    ).fetchall()
+    by_day = conn.execute(
+        """
+        SELECT substr(published_at, 1, 10) AS day, sentiment, COUNT(*)
+        FROM news JOIN analysis ON analysis.news_id = news.id
+        GROUP BY day, sentiment
+    """
+    ).fetchall()
+    conn.close()
+    return by_source, by_day
+
+
+def load_tables(snapshot):
+    return snapshot.news(), snapshot.table("analysis")
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:>10.1f} ms")
+    return result
+
+
+def run(args, workdir):
+    init_db()
+    NewsDatabase().init_analysis_table()
+    print(f"🧪 Building a synthetic news.db with {args.articles:,} articles...")
+    populate(args.articles, args.days)
+    db_mb = os.path.getsize("news.db") / 1e6
+
+    print(f"📂 {workdir} (news.db: {db_mb:.0f} MB)")
+    print("=" * 58)
+    if not args.skip_row_by_row:
+        timed("count by source, NewsDatabase row by row", row_by_row, args.articles)
+    timed("count by source + sentiment/day, SQLite", sqlite_group_by)
+
+    written = timed("export, first run", export, "news.db", "news_parquet", 50_000, 0)
+    new_rows = max(args.articles // 100, 1)
+    populate(new_rows, 1, first_id=args.articles + 1)
+    timed(
+        f"export, incremental (+{new_rows:,} articles)",
+        export,
+        "news.db",
+        "news_parquet",
+        50_000,
+        0,
+    )
+
+    parquet_mb = (
+        sum(p.stat().st_size for p in Path("news_parquet").rglob("*.parquet")) / 1e6
+    )
+    snapshot = NewsSnapshot("news_parquet")
+    timed("decode to Arrow cache (first query only)", load_tables, snapshot)
+
+    # A fresh snapshot, as a new process would open it
+    snapshot = NewsSnapshot("news_parquet")
+    before = pa.total_allocated_bytes()
+    news, analysis = timed("memory-map news + analysis", load_tables, snapshot)
+    allocated = pa.total_allocated_bytes() - before
+    timed("count by source, Arrow", snapshot.count_by_source)
+    timed("sentiment by day, Arrow (first call)", snapshot.sentiment_by_day)
+    timed("sentiment by day, Arrow", snapshot.sentiment_by_day)
+    last_week = (datetime.now(timezone.utc) - timedelta(days=7)).date()
+    timed("count by source, last 7 days, Arrow", snapshot.count_by_source, last_week)
+    print("=" * 58)
+    print(
+        f"📦 {written['news']:,} news + {written['analysis']:,} analysis rows → "
+        f"{parquet_mb:.0f} MB of Parquet"
+    )
+    print(
+        f"🗺️  {news.num_rows + analysis.num_rows:,} rows mapped with "
+        f"{allocated / 1e6:.1f} MB of Arrow memory allocated"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Row-by-row vs columnar queries")
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument(
+        "--skip-row-by-row", action="store_true", help="Skip the slowest baseline"
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep news.db and the export afterwards"
+    )
+    args = parser.parse_args()
+
+    # news.db, the Parquet files and the Arrow cache take hundreds of MB
+    workdir = tempfile.mkdtemp(prefix="news_analytics_")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        run(args, workdir)
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"📂 Kept {workdir}")
+        else:
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
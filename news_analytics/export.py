@@ -0,0 +1,280 @@
+# python3.10 export.py --db ../type_safe_news_agent/news.db --out news_parquet
+"""
+Incremental columnar export of ``news.db``.
+
+Copies new rows from the ``news`` table (and the ``analysis`` table written by
+``pydantic_ai_example/news_pipeline.py``, if present) into zstd-compressed
+Parquet files partitioned by day:
+
+    news_parquet/news/day=2025-01-31/part-000003-0.parquet
+    news_parquet/analysis/day=2025-01-31/part-000003-0.parquet
+
+Each run only reads rows past the high-water marks saved in
+``_export_state.json``, opens SQLite read-only and streams it in chunks, so
+it is cheap to run after every scrape or from cron.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+NEWS_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("url", pa.string()),
+        ("summary", pa.string()),
+        ("published_at", pa.timestamp("us", tz="UTC")),
+        ("source", pa.string()),
+    ]
+)
+
+ANALYSIS_SCHEMA = pa.schema(
+    [
+        ("news_id", pa.int64()),
+        ("sentiment", pa.string()),
+        ("confidence", pa.float64()),
+        ("primary_topic", pa.string()),
+        ("keywords", pa.list_(pa.string())),
+        ("ai_summary", pa.string()),
+        ("key_points", pa.list_(pa.string())),
+        ("importance_score", pa.int32()),
+        ("analyzed_at", pa.timestamp("us", tz="UTC")),
+        ("publish_latency_s", pa.float64()),
+        ("pipeline_latency_s", pa.float64()),
+        # Copied from news so sentiment over time needs no join
+        ("published_at", pa.timestamp("us", tz="UTC")),
+    ]
+)
+
+STATE_FILE = "_export_state.json"
+COMPRESSION = "zstd"
+# Upper bound on day partitions written at once (a backfill can span years)
+MAX_OPEN_WRITERS = 64
+
+
+def to_utc(value: str) -> datetime:
+    """Parse a stored ISO timestamp; naive ones are the scraper's local time."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.astimezone(timezone.utc)
+
+
+def _json_lists(values) -> list:
+    # One decode call for the whole chunk instead of one per row
+    return json.loads("[" + ",".join(value or "[]" for value in values) + "]")
+
+
+def load_state(out_dir: Path) -> dict:
+    path = out_dir / STATE_FILE
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"run": 0, "news_last_id": 0, "analysis_last_analyzed_at": ""}
+
+
+def save_state(out_dir: Path, state: dict):
+    # Written last and atomically: a crashed run is simply redone
+    tmp = out_dir / f"{STATE_FILE}.tmp"
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, out_dir / STATE_FILE)
+
+
+class PartitionWriters:
+    """One open Parquet writer per day partition for the current run."""
+
+    def __init__(self, table_dir: Path, schema: pa.Schema, run: int):
+        self.table_dir = table_dir
+        self.schema = schema
+        self.run = run
+        self.writers = OrderedDict()
+        self.files_per_day = {}
+        self.rows = 0
+
+    def write(self, day: str, columns: dict):
+        writer = self.writers.get(day)
+        if writer is None:
+            if len(self.writers) >= MAX_OPEN_WRITERS:
+                self.writers.popitem(last=False)[1].close()
+            n = self.files_per_day.get(day, 0)
+            self.files_per_day[day] = n + 1
+            path = self.table_dir / f"day={day}" / f"part-{self.run:06d}-{n}.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(path, self.schema, compression=COMPRESSION)
+            self.writers[day] = writer
+        self.writers.move_to_end(day)
+        table = pa.table(columns, schema=self.schema)
+        writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        self.writers.clear()
+
+
+def _write_chunk(writers: PartitionWriters, rows_by_day: dict):
+    for day, rows in rows_by_day.items():
+        columns = {
+            field.name: [row[i] for row in rows]
+            for i, field in enumerate(writers.schema)
+        }
+        writers.write(day, columns)
+
+
+def export_news(conn, writers: PartitionWriters, after_id: int, chunk_rows: int):
+    """Append news rows with ``id > after_id``; returns the new high-water mark."""
+    cursor = conn.execute(
+        """
+        SELECT id, title, url, summary, published_at, source
+        FROM news
+        WHERE id > ?
+        ORDER BY id
+    """,
+        (after_id,),
+    )
+    last_id = after_id
+    while rows := cursor.fetchmany(chunk_rows):
+        rows_by_day = {}
+        for news_id, title, url, summary, published_at, source in rows:
+            published = to_utc(published_at)
+            rows_by_day.setdefault(published.date().isoformat(), []).append(
+                (news_id, title, url, summary, published, source)
+            )
+        _write_chunk(writers, rows_by_day)
+        last_id = rows[-1][0]
+    return last_id
+
+
+def export_analysis(conn, writers, after: str, before: str, chunk_rows: int):
+    """Append analysis rows with ``after < analyzed_at <= before``.
+
+    Returns the new high-water mark (an ``analyzed_at`` string).
+    """
+    cursor = conn.execute(
+        """
+        SELECT analysis.news_id, sentiment, confidence, primary_topic, keywords,
+               ai_summary, key_points, importance_score, analyzed_at,
+               publish_latency_s, pipeline_latency_s, news.published_at
+        FROM analysis
+        LEFT JOIN news ON news.id = analysis.news_id
+        WHERE analyzed_at > ? AND analyzed_at <= ?
+        ORDER BY analyzed_at
+    """,
+        (after, before),
+    )
+    last = after
+    while rows := cursor.fetchmany(chunk_rows):
+        rows_by_day = {}
+        keywords = _json_lists(row[4] for row in rows)
+        key_points = _json_lists(row[6] for row in rows)
+        for row, row_keywords, row_key_points in zip(rows, keywords, key_points):
+            analyzed = to_utc(row[8])
+            rows_by_day.setdefault(analyzed.date().isoformat(), []).append(
+                (
+                    *row[:4],
+                    row_keywords,
+                    row[5],
+                    row_key_points,
+                    row[7],
+                    analyzed,
+                    row[9],
+                    row[10],
+                    to_utc(row[11]) if row[11] else None,
+                )
+            )
+        _write_chunk(writers, rows_by_day)
+        last = rows[-1][8]
+    return last
+
+
+def _remove_run_files(out_dir: Path, run: int):
+    # Leftovers from an earlier attempt at this run that crashed before
+    # saving its state; rewriting them from scratch keeps exports idempotent
+    for path in out_dir.glob(f"*/day=*/part-{run:06d}-*.parquet"):
+        path.unlink()
+
+
+def export(db_path="news.db", out_dir="news_parquet", chunk_rows=50_000, settle=60):
+    """Export rows added since the last run. Returns rows written per table.
+
+    Analysis rows younger than ``settle`` seconds are left for the next run:
+    pipeline workers stamp ``analyzed_at`` just before their insert commits,
+    so a slightly older row can still show up after a newer one.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state = load_state(out_dir)
+    run = state["run"] + 1
+    _remove_run_files(out_dir, run)
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    written = {}
+    try:
+        writers = PartitionWriters(out_dir / "news", NEWS_SCHEMA, run)
+        try:
+            state["news_last_id"] = export_news(
+                conn, writers, state["news_last_id"], chunk_rows
+            )
+        finally:
+            writers.close()
+        written["news"] = writers.rows
+
+        has_analysis = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'analysis'"
+        ).fetchone()
+        if has_analysis:
+            cutoff = (datetime.now() - timedelta(seconds=settle)).isoformat()
+            writers = PartitionWriters(out_dir / "analysis", ANALYSIS_SCHEMA, run)
+            try:
+                state["analysis_last_analyzed_at"] = export_analysis(
+                    conn,
+                    writers,
+                    state["analysis_last_analyzed_at"],
+                    cutoff,
+                    chunk_rows,
+                )
+            finally:
+                writers.close()
+            written["analysis"] = writers.rows
+    finally:
+        conn.close()
+
+    state["run"] = run
+    save_state(out_dir, state)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export news.db to Parquet by day")
+    parser.add_argument("--db", default="news.db", help="SQLite file to read")
+    parser.add_argument("--out", default="news_parquet", help="Export directory")
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=60,
+        help="Skip analysis rows younger than this many seconds",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"❌ {args.db} not found. Run the news scraper first!")
+        return
+    start = time.perf_counter()
+    written = export(args.db, args.out, args.chunk_rows, args.settle)
+    elapsed = time.perf_counter() - start
+    counts = ", ".join(f"{rows} {table} rows" for table, rows in written.items())
+    print(f"📦 Exported {counts} to {args.out}/ in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
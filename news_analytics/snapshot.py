@@ -0,0 +1,210 @@
+# python3.10 snapshot.py --root news_parquet
+"""
+Memory-mapped query API over the Parquet export.
+
+Parquet is compressed, so reading it always means decoding. The first time a
+part file is queried it is decoded once into an uncompressed Arrow IPC copy
+under ``<root>/.arrow_cache``. After that every query memory-maps those
+copies: tables are built without copying or allocating column data, the OS
+page cache is shared between processes, and only the columns a query touches
+are ever read from disk. ``news.db`` is never opened.
+"""
+
+import argparse
+import os
+import time
+from datetime import date
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+CACHE_DIR = ".arrow_cache"
+# Low-cardinality strings kept dictionary-encoded; grouping on them is
+# several times faster than on plain strings
+DICTIONARY_COLUMNS = {
+    "news": ["source"],
+    "analysis": ["sentiment", "primary_topic"],
+}
+
+
+def _day(value) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+def _decoded(table: pa.Table) -> pa.Table:
+    """Dictionary columns of a (small) result back to plain values."""
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            decoded = pc.cast(table.column(i), field.type.value_type)
+            table = table.set_column(i, field.name, decoded)
+    return table
+
+
+class NewsSnapshot:
+    """Read-only, memory-mapped view of an export directory.
+
+    ``start`` / ``end`` arguments are inclusive days (``date`` or
+    ``"YYYY-MM-DD"``) and prune whole partitions before anything is read.
+    News is partitioned by publish day (UTC), analysis by analysis day.
+    """
+
+    def __init__(self, root: str = "news_parquet"):
+        self.root = Path(root)
+        if not (self.root / "news").is_dir():
+            raise FileNotFoundError(f"No export found in {self.root}/; run export.py")
+        self._tables = {}
+
+    def _arrow_file(self, parquet_path: Path) -> Path:
+        cached = (
+            self.root / CACHE_DIR / parquet_path.relative_to(self.root)
+        ).with_suffix(".arrow")
+        if cached.exists() and cached.stat().st_mtime >= parquet_path.stat().st_mtime:
+            return cached
+        name = parquet_path.relative_to(self.root).parts[0]
+        day = date.fromisoformat(parquet_path.parent.name.removeprefix("day="))
+        table = pq.read_table(parquet_path, read_dictionary=DICTIONARY_COLUMNS[name])
+        table = table.append_column("day", pa.repeat(pa.scalar(day), table.num_rows))
+        # IPC files allow one dictionary per column, not one per row group
+        table = table.unify_dictionaries().combine_chunks()
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(".arrow.tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, cached)
+        return cached
+
+    def table(self, name: str, start=None, end=None) -> pa.Table:
+        """All rows of ``news`` or ``analysis`` in the given day range."""
+        start, end = _day(start), _day(end)
+        key = (name, start, end)
+        if key not in self._tables:
+            parts = []
+            for day_dir in sorted((self.root / name).glob("day=*")):
+                day = day_dir.name.removeprefix("day=")
+                if (start and day < start) or (end and day > end):
+                    continue
+                for path in sorted(day_dir.glob("*.parquet")):
+                    source = pa.memory_map(str(self._arrow_file(path)), "r")
+                    parts.append(pa.ipc.open_file(source).read_all())
+            if not parts:
+                return pa.table({})
+            # Each file has its own dictionaries; only their indices get remapped
+            self._tables[key] = pa.concat_tables(parts).unify_dictionaries()
+        return self._tables[key]
+
+    def news(self, start=None, end=None) -> pa.Table:
+        return self.table("news", start, end)
+
+    def analysis(self) -> pa.Table:
+        """Analysis results, one row per article (the latest if re-analyzed)."""
+        key = ("analysis", "latest")
+        if key in self._tables:
+            return self._tables[key]
+        table = self.table("analysis")
+        if table.num_rows == 0:
+            return table
+        if pc.count_distinct(table["news_id"]).as_py() < table.num_rows:
+            # Newest first within each article, then keep each article's first row
+            order = pc.sort_indices(
+                table, [("news_id", "ascending"), ("analyzed_at", "descending")]
+            )
+            ids = table["news_id"].take(order).combine_chunks()
+            first = pa.concat_arrays(
+                [pa.array([True]), pc.not_equal(ids[1:], ids[:-1])]
+            )
+            table = table.take(order.filter(first))
+        self._tables[key] = table
+        return table
+
+    def count_by_source(self, start=None, end=None) -> pa.Table:
+        """Articles per source, most first."""
+        news = self.news(start, end)
+        if news.num_rows == 0:
+            return news
+        counts = news.group_by("source").aggregate([("id", "count")])
+        counts = counts.select(["source", "id_count"]).rename_columns(
+            ["source", "articles"]
+        )
+        counts = _decoded(counts)
+        return counts.sort_by([("articles", "descending")])
+
+    def articles_by_day(self, start=None, end=None) -> pa.Table:
+        news = self.news(start, end)
+        if news.num_rows == 0:
+            return news
+        counts = news.group_by("day").aggregate([("id", "count")])
+        counts = counts.select(["day", "id_count"]).rename_columns(["day", "articles"])
+        return counts.sort_by("day")
+
+    def sentiment_by_day(self, start=None, end=None) -> pa.Table:
+        """Analyzed articles per publish day (UTC) and sentiment."""
+        analysis = self.analysis()
+        if analysis.num_rows == 0:
+            return analysis
+        table = pa.table(
+            {
+                "day": pc.cast(analysis["published_at"], pa.date32()),
+                "sentiment": analysis["sentiment"],
+                "importance_score": analysis["importance_score"],
+            }
+        )
+        start, end = _day(start), _day(end)
+        if start:
+            table = table.filter(pc.field("day") >= date.fromisoformat(start))
+        if end:
+            table = table.filter(pc.field("day") <= date.fromisoformat(end))
+        result = table.group_by(["day", "sentiment"]).aggregate(
+            [([], "count_all"), ("importance_score", "mean")]
+        )
+        result = result.select(
+            ["day", "sentiment", "count_all", "importance_score_mean"]
+        ).rename_columns(["day", "sentiment", "articles", "mean_importance"])
+        result = _decoded(result)
+        return result.sort_by([("day", "ascending"), ("sentiment", "ascending")])
+
+    def top_topics(self, n: int = 10) -> pa.Table:
+        analysis = self.analysis()
+        if analysis.num_rows == 0:
+            return analysis
+        counts = analysis.group_by("primary_topic").aggregate([("news_id", "count")])
+        counts = counts.select(["primary_topic", "news_id_count"]).rename_columns(
+            ["primary_topic", "articles"]
+        )
+        counts = _decoded(counts)
+        return counts.sort_by([("articles", "descending")]).slice(0, n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the news Parquet export")
+    parser.add_argument("--root", default="news_parquet", help="Export directory")
+    parser.add_argument("--start", help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    snapshot = NewsSnapshot(args.root)
+    queries = {
+        "📰 Articles by source": lambda: snapshot.count_by_source(args.start, args.end),
+        "📅 Articles by day": lambda: snapshot.articles_by_day(args.start, args.end),
+        "💭 Sentiment by day": lambda: snapshot.sentiment_by_day(args.start, args.end),
+        "🏷️  Top topics": snapshot.top_topics,
+    }
+    for title, query in queries.items():
+        start = time.perf_counter()
+        result = query()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{title} ({elapsed:.1f} ms)")
+        print("=" * 50)
+        if result.num_rows:
+            print(result.to_pandas().head(20).to_string(index=False))
+        else:
+            print("(no data)")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# python3.10 benchmark.py --tasks 400 --concurrency 16
+"""
+Requests/sec for AutoGen and Agno agents against a local stub LLM, with a
+fresh model client per task (as in autogen_hello / agno_hello) versus the
+shared ``LLMClientPool``.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import warnings
+from pathlib import Path
+
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+from autogen_agentchat.agents import AssistantAgent
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+from client_pool import LLMClientPool
+
+# Reuse the stub server from the framework benchmark
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "framework_benchmark"))
+from stub_server import start_stub_server  # noqa: E402
+
+MODEL = "gpt-4o-mini"
+API_KEY = "stub"
+PROMPT = "Say 'Hello, World!'"
+
+
+async def autogen_fresh_client(base_url):
+    model_client = OpenAIChatCompletionClient(
+        model=MODEL, base_url=base_url, api_key=API_KEY
+    )
+    agent = AssistantAgent("assistant", model_client=model_client)
+    await agent.run(task=PROMPT)
+    await model_client.close()
+
+
+async def agno_fresh_client(base_url):
+    agent = Agent(model=OpenAIChat(id=MODEL, base_url=base_url, api_key=API_KEY))
+    await agent.arun(PROMPT)
+
+
+async def run_tasks(task_fn, n_tasks, concurrency):
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with limit:
+            await task_fn()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n_tasks)))
+    return n_tasks / (time.perf_counter() - start)
+
+
+async def benchmark(base_url, n_tasks, concurrency):
+    results = {}
+    results["autogen", "fresh client per task"] = await run_tasks(
+        lambda: autogen_fresh_client(base_url), n_tasks, concurrency
+    )
+    results["agno", "fresh client per task"] = await run_tasks(
+        lambda: agno_fresh_client(base_url), n_tasks, concurrency
+    )
+
+    async with LLMClientPool(
+        base_url=base_url, api_key=API_KEY, max_connections=concurrency
+    ) as pool:
+        model_client = pool.autogen_model_client(MODEL)
+
+        async def autogen_pooled():
+            agent = AssistantAgent("assistant", model_client=model_client)
+            async with pool.task():
+                await agent.run(task=PROMPT)
+
+        async def agno_pooled():
+            agent = Agent(model=pool.agno_model(MODEL))
+            async with pool.task():
+                await agent.arun(PROMPT)
+
+        results["autogen", "shared pool"] = await run_tasks(
+            autogen_pooled, n_tasks, concurrency
+        )
+        results["agno", "shared pool"] = await run_tasks(
+            agno_pooled, n_tasks, concurrency
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pooled vs per-task LLM clients")
+    parser.add_argument("--tasks", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub seconds")
+    args = parser.parse_args()
+
+    # The stub echoes the bare model name, which AutoGen warns about
+    warnings.filterwarnings("ignore", message="Resolved model mismatch")
+
+    server = start_stub_server(latency=args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    print(
+        f"🏁 {args.tasks} tasks, {args.concurrency} at a time, stub latency "
+        f"{args.latency * 1000:.0f} ms"
+    )
+    print("=" * 50)
+    results = asyncio.run(benchmark(base_url, args.tasks, args.concurrency))
+    for framework in ("autogen", "agno"):
+        before = results[framework, "fresh client per task"]
+        after = results[framework, "shared pool"]
+        print(f"{framework:<8} fresh client per task {before:>8.1f} req/s")
+        print(
+            f"{framework:<8} shared pool           {after:>8.1f} req/s"
+            f"  ({after / before:.1f}x)"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Shared LLM Client Pool
+"""
+One long-lived set of keep-alive HTTP connections for every agent in a
+process.
+
+AutoGen's ``OpenAIChatCompletionClient`` and Agno's ``OpenAIChat`` normally
+each build their own OpenAI client (and connection pool) per agent. Here a
+single ``LLMClientPool`` owns the httpx clients, with bounded connections,
+and hands out framework model clients that reuse them.
+"""
+
+import asyncio
+import functools
+import os
+from contextlib import asynccontextmanager
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+
+class PoolClosedError(RuntimeError):
+    """Raised when a task is started on a pool that is shutting down."""
+
+
+@functools.cache
+def _pooled_autogen_client_class():
+    # Imported lazily so Agno-only users don't need AutoGen installed
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+    class PooledChatCompletionClient(OpenAIChatCompletionClient):
+        async def close(self) -> None:
+            pass  # The pool owns the connections; see LLMClientPool.aclose
+
+    return PooledChatCompletionClient
+
+
+class LLMClientPool:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+    ):
+        self.base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.async_http = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self.http = httpx.Client(limits=limits, timeout=timeout)
+        self.async_openai = AsyncOpenAI(
+            base_url=self.base_url, api_key=self.api_key, http_client=self.async_http
+        )
+        self.openai = OpenAI(
+            base_url=self.base_url, api_key=self.api_key, http_client=self.http
+        )
+        self._active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closing = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    @asynccontextmanager
+    async def task(self):
+        """Track one agent task so shutdown can wait for it to finish."""
+        if self._closing:
+            raise PoolClosedError("LLM client pool is shutting down")
+        self._active += 1
+        self._idle.clear()
+        try:
+            yield self
+        finally:
+            self._active -= 1
+            if self._active == 0:
+                self._idle.set()
+
+    async def aclose(self, timeout: float | None = 30.0) -> None:
+        """Stop accepting tasks, let running ones finish, then close connections."""
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️  Closing pool with {self._active} task(s) still running")
+        await self.async_http.aclose()
+        self.http.close()
+
+    def autogen_model_client(self, model: str = "gpt-4o-mini", **kwargs):
+        """An AutoGen model client that sends requests over the shared pool."""
+        return _pooled_autogen_client_class()(
+            model=model,
+            base_url=self.base_url,
+            api_key=self.api_key,
+            http_client=self.async_http,
+            **kwargs,
+        )
+
+    def agno_model(self, id: str = "gpt-4o-mini", **kwargs):
+        """An Agno OpenAIChat model that reuses the shared OpenAI clients."""
+        from agno.models.openai import OpenAIChat
+
+        return OpenAIChat(
+            id=id,
+            base_url=self.base_url,
+            api_key=self.api_key,
+            client=self.openai,
+            async_client=self.async_openai,
+            **kwargs,
+        )
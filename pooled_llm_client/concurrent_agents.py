@@ -0,0 +1,50 @@
+# python3.10 concurrent_agents.py
+"""
+Several AutoGen and Agno agents answering questions concurrently over one
+shared, long-lived LLM client pool.
+"""
+
+import asyncio
+
+from agno.agent import Agent
+from autogen_agentchat.agents import AssistantAgent
+from client_pool import LLMClientPool
+
+QUESTIONS = [
+    "What's the capital of Peru?",
+    "What's the capital of Morocco?",
+    "Say 'Hello, World!' in French.",
+    "Name one prime number greater than 100.",
+]
+
+
+async def ask_autogen(pool, name, question):
+    agent = AssistantAgent(name, model_client=pool.autogen_model_client())
+    async with pool.task():
+        result = await agent.run(task=question)
+    return name, result.messages[-1].content
+
+
+async def ask_agno(pool, name, question):
+    agent = Agent(
+        model=pool.agno_model(),
+        instructions="Provide concise answers.",
+    )
+    async with pool.task():
+        response = await agent.arun(question)
+    return name, response.content
+
+
+async def main() -> None:
+    async with LLMClientPool(max_connections=8) as pool:
+        tasks = []
+        for i, question in enumerate(QUESTIONS):
+            tasks.append(ask_autogen(pool, f"autogen_{i}", question))
+            tasks.append(ask_agno(pool, f"agno_{i}", question))
+        for name, answer in await asyncio.gather(*tasks):
+            print(f"🤖 {name}: {answer}")
+    # Leaving the block waits for running tasks, then closes the connections
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
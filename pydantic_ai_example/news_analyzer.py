@@ -5,17 +5,32 @@ This script demonstrates how to use Pydantic AI to create intelligent agents
 that can analyze news articles with structured, type-safe responses.
 """
 
+import json
 import sqlite3
+from contextlib import nullcontext
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent, RunContext
 
+try:
+    # Optional tracing: run with PYTHONPATH=../agent_tracing to enable it
+    from tracer import AGENT, DB, TOOL, span, traced
+except ImportError:
+    AGENT = DB = TOOL = None
+
+    def span(name, category=None, **attrs):
+        return nullcontext()
+
+    def traced(category=None, name=None):
+        return lambda func: func
+
 
 class NewsArticle(BaseModel):
     """Structured representation of a news article from our database."""
 
+    id: Optional[int] = None
     title: str
     url: str
     summary: str
@@ -60,6 +75,7 @@ class NewsDatabase:
     def __init__(self, db_path: str = "news.db"):
         self.db_path = db_path
 
+    @traced(DB, "news.get_recent_articles")
     def get_recent_articles(self, limit: int = 5) -> List[NewsArticle]:
         """Fetch recent articles from the database."""
         conn = sqlite3.connect(self.db_path)
@@ -89,6 +105,7 @@ class NewsDatabase:
         conn.close()
         return articles
 
+    @traced(DB, "news.search_articles")
     def search_articles(self, keyword: str, limit: int = 3) -> List[NewsArticle]:
         """Search articles by keyword."""
         conn = sqlite3.connect(self.db_path)
@@ -119,6 +136,95 @@ class NewsDatabase:
         conn.close()
         return articles
 
+    def init_analysis_table(self):
+        """Create the table that holds one analysis row per analyzed article."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis (
+                news_id INTEGER PRIMARY KEY REFERENCES news(id),
+                sentiment TEXT,
+                confidence REAL,
+                primary_topic TEXT,
+                keywords TEXT,
+                ai_summary TEXT,
+                key_points TEXT,
+                importance_score INTEGER,
+                analyzed_at TEXT,
+                publish_latency_s REAL,
+                pipeline_latency_s REAL
+            )
+        """
+        )
+        conn.commit()
+        conn.close()
+
+    @traced(DB, "news.get_unanalyzed_articles")
+    def get_unanalyzed_articles(self, limit: int = 1000) -> List[NewsArticle]:
+        """Articles that have no analysis row yet, oldest first."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            SELECT news.id, title, url, summary, published_at, source
+            FROM news
+            LEFT JOIN analysis ON analysis.news_id = news.id
+            WHERE analysis.news_id IS NULL
+            ORDER BY news.id
+            LIMIT ?
+        """,
+            (limit,),
+        )
+
+        articles = []
+        for row in cursor.fetchall():
+            article = NewsArticle(
+                id=row[0],
+                title=row[1],
+                url=row[2],
+                summary=row[3],
+                published_at=datetime.fromisoformat(row[4]),
+                source=row[5],
+            )
+            articles.append(article)
+
+        conn.close()
+        return articles
+
+    @traced(DB, "news.save_analysis")
+    def save_analysis(
+        self,
+        news_id: int,
+        sentiment: NewsSentiment,
+        topics: NewsTopics,
+        summary: NewsSummary,
+        publish_latency_s: Optional[float] = None,
+        pipeline_latency_s: Optional[float] = None,
+    ):
+        """Store the three agents' outputs for one article."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO analysis VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                news_id,
+                sentiment.sentiment,
+                sentiment.confidence,
+                topics.primary_topic,
+                json.dumps(topics.keywords),
+                summary.ai_summary,
+                json.dumps(summary.key_points),
+                summary.importance_score,
+                datetime.now().isoformat(),
+                publish_latency_s,
+                pipeline_latency_s,
+            ),
+        )
+        conn.commit()
+        conn.close()
+
 
 # Create specialized AI agents for different news analysis tasks
 
@@ -160,18 +266,21 @@ summary_agent = Agent[NewsDatabase, NewsSummary](
 
 
 @sentiment_agent.tool
+@traced(TOOL)
 def analyze_article_sentiment(ctx: RunContext[NewsDatabase], article_text: str) -> str:
     """Tool to provide article text for sentiment analysis."""
     return f"Analyzing sentiment for: {article_text}"
 
 
 @topic_agent.tool
+@traced(TOOL)
 def extract_article_topics(ctx: RunContext[NewsDatabase], article_text: str) -> str:
     """Tool to provide article text for topic extraction."""
     return f"Extracting topics from: {article_text}"
 
 
 @summary_agent.tool
+@traced(TOOL)
 def enhance_article_summary(ctx: RunContext[NewsDatabase], article_text: str) -> str:
     """Tool to provide article text for summary enhancement."""
     return f"Enhancing summary for: {article_text}"
@@ -207,10 +316,11 @@ def analyze_recent_news():
             # Sentiment Analysis
             print("💭 Sentiment Analysis:")
             try:
-                sentiment_result = sentiment_agent.run_sync(
-                    f"Analyze the sentiment of this news article:\n{article_text}",
-                    deps=db,
-                )
+                with span("sentiment_agent", AGENT):
+                    sentiment_result = sentiment_agent.run_sync(
+                        f"Analyze the sentiment of this news article:\n{article_text}",
+                        deps=db,
+                    )
                 sentiment = sentiment_result.output
                 print(
                     f"   Sentiment: {sentiment.sentiment} (confidence: {sentiment.confidence:.2f})"
@@ -222,10 +332,11 @@ def analyze_recent_news():
             # Topic Extraction
             print("\n🏷️  Topic Analysis:")
             try:
-                topic_result = topic_agent.run_sync(
-                    f"Extract topics and keywords from this news article:\n{article_text}",
-                    deps=db,
-                )
+                with span("topic_agent", AGENT):
+                    topic_result = topic_agent.run_sync(
+                        f"Extract topics and keywords from this news article:\n{article_text}",
+                        deps=db,
+                    )
                 topics = topic_result.output
                 print(f"   Primary Topic: {topics.primary_topic}")
                 print(f"   Secondary Topics: {', '.join(topics.secondary_topics)}")
@@ -236,10 +347,11 @@ def analyze_recent_news():
             # Enhanced Summary
             print("\n📝 Enhanced Summary:")
             try:
-                summary_result = summary_agent.run_sync(
-                    f"Create an enhanced summary for this news article:\n{article_text}",
-                    deps=db,
-                )
+                with span("summary_agent", AGENT):
+                    summary_result = summary_agent.run_sync(
+                        f"Create an enhanced summary for this news article:\n{article_text}",
+                        deps=db,
+                    )
                 enhanced = summary_result.output
                 print(f"   AI Summary: {enhanced.ai_summary}")
                 print(f"   Key Points: {'; '.join(enhanced.key_points)}")
@@ -277,9 +389,10 @@ def search_and_analyze():
                     f"Title: {articles[0].title}\nSummary: {articles[0].summary}"
                 )
                 try:
-                    sentiment_result = sentiment_agent.run_sync(
-                        f"Analyze sentiment: {article_text}", deps=db
-                    )
+                    with span("sentiment_agent", AGENT, search_term=term):
+                        sentiment_result = sentiment_agent.run_sync(
+                            f"Analyze sentiment: {article_text}", deps=db
+                        )
                     print(f"  📊 Sentiment: {sentiment_result.output.sentiment}")
                 except Exception as e:
                     print(f"  ❌ Analysis error: {e}")
@@ -0,0 +1,264 @@
+# python3.10 news_pipeline.py --workers 4 --queue-size 16 --interval 300
+"""
+Streaming Scrape-to-Analysis Pipeline
+
+The scraper from the type-safe news agent is the producer: every newly
+inserted article is pushed onto a bounded queue, and a pool of workers runs
+the sentiment, topic and summary agents on it as soon as it arrives. When the
+workers fall behind, the queue fills up and the scraper waits for space
+(backpressure) instead of racing ahead.
+
+Results go to an ``analysis`` table next to ``news``. Articles without one,
+e.g. from an earlier scraper run, are picked up when the pipeline starts.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+# Reuse the scraper and its news table from the type-safe news agent
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "type_safe_news_agent"))
+from agent import NEWS_SITES, fetch_articles_from_url  # noqa: E402
+from database import init_db, save_news_summary  # noqa: E402
+from news_analyzer import (  # noqa: E402
+    NewsArticle,
+    NewsDatabase,
+    sentiment_agent,
+    summary_agent,
+    topic_agent,
+)
+
+try:
+    # Optional tracing: run with PYTHONPATH=../agent_tracing to enable it
+    from tracer import AGENT, span
+except ImportError:
+    AGENT = None
+
+    def span(name, category=None, **attrs):
+        return nullcontext()
+
+
+LATENCY_METRICS = {
+    "queue_wait": "queue wait",
+    "analysis": "analysis (3 agents)",
+    "insert_to_analysis": "insert → analyzed",
+    "publish_to_analysis": "publish → analyzed",
+}
+
+
+class PipelineStats:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.latencies = defaultdict(list)
+        self.inserted = 0
+        self.analyzed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.producer_waits = 0
+
+    def record(self, metric: str, seconds: float):
+        self.latencies[metric].append(seconds)
+
+    def report(self, elapsed: float, workers: int):
+        print("=" * 50)
+        print(
+            f"🏁 Analyzed {self.analyzed} articles ({self.failed} failed, "
+            f"{self.inserted} newly scraped) in {elapsed:.1f}s with {workers} workers"
+        )
+        print(
+            f"   Queue: max depth {self.max_depth}/{self.queue_size}, "
+            f"scraper waited for space {self.producer_waits} times"
+        )
+        print(f"   {'latency':<22}{'count':>6}{'p50':>10}{'p95':>10}{'max':>10}")
+        for metric, label in LATENCY_METRICS.items():
+            values = sorted(self.latencies[metric])
+            if not values:
+                continue
+            print(
+                f"   {label:<22}{len(values):>6}{_fmt(_percentile(values, 50)):>10}"
+                f"{_fmt(_percentile(values, 95)):>10}{_fmt(values[-1]):>10}"
+            )
+
+
+def _percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    index = max(0, round(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _fmt(seconds):
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds:.2f}s"
+
+
+def seconds_since(moment: datetime) -> float:
+    # Feed dates are usually timezone-aware; the scraper's fallback is local time
+    now = datetime.now(moment.tzinfo) if moment.tzinfo else datetime.now()
+    return (now - moment).total_seconds()
+
+
+async def enqueue(queue: asyncio.Queue, article, inserted_at, stats):
+    await queue.put((article, inserted_at, time.perf_counter()))
+    stats.max_depth = max(stats.max_depth, queue.qsize())
+
+
+async def produce(queue, sites, stats, interval=None):
+    """Scrape every site (every ``interval`` seconds, or once) and queue new rows."""
+    while True:
+        for site in sites:
+            print(f"🌐 Scraping {site}")
+            summaries = await asyncio.to_thread(fetch_articles_from_url, site)
+            for news in summaries:
+                news_id = await asyncio.to_thread(save_news_summary, news)
+                if news_id is None:
+                    continue  # Already stored (and queued) by an earlier scrape
+                stats.inserted += 1
+                article = NewsArticle(
+                    id=news_id,
+                    title=news.title,
+                    url=str(news.url),
+                    summary=news.summary,
+                    published_at=news.published_at,
+                    source=news.source,
+                )
+                # Waits here while the queue is full, so scraping slows to
+                # the pace of analysis
+                if queue.full():
+                    stats.producer_waits += 1
+                await enqueue(queue, article, time.time(), stats)
+        if interval is None:
+            return
+        await asyncio.sleep(interval)
+
+
+async def analyze_article(article: NewsArticle, db: NewsDatabase):
+    """Run the three agents on one article concurrently."""
+    article_text = f"Title: {article.title}\nSummary: {article.summary}"
+    sentiment, topics, summary = await asyncio.gather(
+        sentiment_agent.run(
+            f"Analyze the sentiment of this news article:\n{article_text}", deps=db
+        ),
+        topic_agent.run(
+            f"Extract topics and keywords from this news article:\n{article_text}",
+            deps=db,
+        ),
+        summary_agent.run(
+            f"Create an enhanced summary for this news article:\n{article_text}",
+            deps=db,
+        ),
+    )
+    return sentiment.output, topics.output, summary.output
+
+
+async def worker(queue: asyncio.Queue, db: NewsDatabase, stats: PipelineStats):
+    while True:
+        article, inserted_at, enqueued_at = await queue.get()
+        try:
+            stats.record("queue_wait", time.perf_counter() - enqueued_at)
+            start = time.perf_counter()
+            with span("analyze_article", AGENT, news_id=article.id):
+                sentiment, topics, summary = await analyze_article(article, db)
+            stats.record("analysis", time.perf_counter() - start)
+
+            publish_latency = seconds_since(article.published_at)
+            insert_latency = time.time() - inserted_at if inserted_at else None
+            await asyncio.to_thread(
+                db.save_analysis,
+                article.id,
+                sentiment,
+                topics,
+                summary,
+                publish_latency,
+                insert_latency,
+            )
+            stats.analyzed += 1
+            # Backlog articles can be days old; only fresh scrapes say how
+            # far behind the news the pipeline runs
+            if insert_latency is not None:
+                stats.record("insert_to_analysis", insert_latency)
+                stats.record("publish_to_analysis", publish_latency)
+            print(
+                f"✅ [{article.id}] {article.title[:50]} → {sentiment.sentiment}, "
+                f"{topics.primary_topic}, {summary.importance_score}/10"
+            )
+        except Exception as e:
+            # Left without an analysis row, so the next run retries it
+            stats.failed += 1
+            print(f"❌ [{article.id}] {article.title[:50]}: {e}")
+        finally:
+            queue.task_done()
+
+
+async def run_pipeline(
+    sites, workers=4, queue_size=16, interval=None, backlog_limit=1000
+):
+    init_db()
+    db = NewsDatabase()
+    db.init_analysis_table()
+    queue = asyncio.Queue(maxsize=queue_size)
+    stats = PipelineStats(queue_size)
+
+    worker_tasks = [
+        asyncio.create_task(worker(queue, db, stats), name=f"worker-{i}")
+        for i in range(workers)
+    ]
+    backlog = await asyncio.to_thread(db.get_unanalyzed_articles, backlog_limit)
+    print(f"📥 {len(backlog)} unanalyzed articles already in news.db")
+
+    async def feed_backlog():
+        for article in backlog:
+            await enqueue(queue, article, None, stats)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(feed_backlog(), produce(queue, sites, stats, interval))
+        await queue.join()
+    finally:
+        for task in worker_tasks:
+            task.cancel()
+        await asyncio.gather(*worker_tasks, return_exceptions=True)
+        stats.report(time.perf_counter() - start, workers)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape and analyze news continuously")
+    parser.add_argument("--sites", nargs="+", default=NEWS_SITES, help="Feed URLs")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent analyses")
+    parser.add_argument(
+        "--queue-size", type=int, default=16, help="Articles waiting for a worker"
+    )
+    parser.add_argument(
+        "--interval", type=float, help="Rescrape every N seconds (default: once)"
+    )
+    parser.add_argument(
+        "--backlog-limit", type=int, default=1000, help="Old articles to pick up"
+    )
+    args = parser.parse_args()
+
+    print("🚀 Starting the news pipeline")
+    print("=" * 50)
+    try:
+        asyncio.run(
+            run_pipeline(
+                args.sites,
+                workers=args.workers,
+                queue_size=args.queue_size,
+                interval=args.interval,
+                backlog_limit=args.backlog_limit,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # News Scraping Agent
+from contextlib import nullcontext
 from datetime import datetime
 from typing import List
 
@@ -7,11 +8,34 @@ from bs4 import BeautifulSoup
 from database import save_news_summary
 from models import NewsSummary
 
+try:
+    # Optional tracing: run with PYTHONPATH=../agent_tracing to enable it
+    from tracer import AGENT, HTTP, span, traced
+except ImportError:
+    AGENT = HTTP = None
+
+    def span(name, category=None, **attrs):
+        return nullcontext()
+
+    def traced(category=None, name=None):
+        return lambda func: func
+
+
+NEWS_SITES = [
+    "https://feeds.npr.org/1001/rss.xml",  # NPR News RSS feed
+    "https://feeds.bbci.co.uk/news/rss.xml",  # BBC News RSS feed
+    "https://feeds.reuters.com/Reuters/worldNews",  # Reuters World News RSS
+    "https://www.reddit.com/r/worldnews/.rss",  # Reddit World News RSS
+]
+
 
 def fetch_articles_from_url(url: str) -> List[NewsSummary]:
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        with span("GET", HTTP, url=url) as s:
+            response = requests.get(url, timeout=10)
+            if s:
+                s.set(status=response.status_code, bytes=len(response.content))
+            response.raise_for_status()
     except Exception as e:
         print(f"Error fetching {url}: {e}")
         return []
@@ -94,6 +118,7 @@ def fetch_articles_from_url(url: str) -> List[NewsSummary]:
     return articles
 
 
+@traced(AGENT)
 def agent_run(news_sites: List[str]):
     for site in news_sites:
         print(f"Scraping {site}")
@@ -3,6 +3,15 @@ import sqlite3
 
 from models import NewsSummary
 
+try:
+    # Optional tracing: run with PYTHONPATH=../agent_tracing to enable it
+    from tracer import DB, traced
+except ImportError:
+    DB = None
+
+    def traced(category=None, name=None):
+        return lambda func: func
+
 
 def init_db():
     conn = sqlite3.connect("news.db")
@@ -23,7 +32,9 @@ def init_db():
     conn.close()
 
 
-def save_news_summary(news: NewsSummary):
+@traced(DB)
+def save_news_summary(news: NewsSummary) -> int | None:
+    """Returns the new row id, or None if the URL is already stored."""
     conn = sqlite3.connect("news.db")
     c = conn.cursor()
     try:
@@ -41,7 +52,9 @@ def save_news_summary(news: NewsSummary):
             ),
         )
         conn.commit()
+        return c.lastrowid if c.rowcount == 1 else None
     except Exception as e:
         print(f"DB error: {e}")
+        return None
     finally:
         conn.close()